@@ -7,407 +7,2463 @@ All credentials and configuration loaded from environment variables.
 
 import sqlite3
 import psycopg2
+import psycopg2.extensions
+import mysql.connector
 import os
+import math
+import signal
 import time
 import threading
+import asyncio
+import heapq
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List, FrozenSet, NamedTuple, Set
 import logging
 import json
-import smtplib
+import re
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from database_utils.email_utils import AlertSender
+from database_utils.database import create_mysql_connection, existing_tables
+from database_utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from database_utils.pool import ConnectionPool
+from database_utils.scheduler import CheckScheduler
+from database_utils.schema_cache import SchemaCache, SchemaSnapshot
+from database_utils.inotify_watcher import InotifyWatcher, inotify_available
+from database_utils.pg_listener import PostgresListener, DEFAULT_CHANNEL
+from database_utils.check_state import CheckStateTable
+from database_utils.catalog import iter_check_catalog, catalog_fields
+from database_utils.state_store import StateStore
+from database_utils.check_history import CheckHistory, ProbeTiming, current_probe_timing, record_connect
+from database_utils.status_server import StatusServer, StatusSnapshot, build_snapshot
+from database_utils.metrics import CheckMetrics
+from database_utils.event_stream import EventBroadcaster
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sent as one round-trip, the statement timeout applies to the lookup that follows.
+# Reads the relations of the public schema straight from pg_catalog and only
+# returns their names when the fingerprint differs from the cached one. The
+# fingerprint changes whenever a relation is created, dropped or renamed, as
+# each of those writes a pg_class row with a new xmin.
+POSTGRES_SCHEMA_SNAPSHOT_QUERY = """
+    SET statement_timeout = %s;
+    WITH rels AS (
+        SELECT c.oid, c.xmin, c.relname FROM pg_catalog.pg_class c
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public' AND c.relkind IN ('r', 'p', 'v', 'f')
+    ), fp AS (
+        SELECT count(*) || ':' || coalesce(sum(oid::int8), 0) || ':' ||
+               coalesce(sum(xmin::text::int8), 0) AS fingerprint
+        FROM rels
+    )
+    SELECT fp.fingerprint,
+           CASE WHEN fp.fingerprint IS DISTINCT FROM %s
+                THEN (SELECT coalesce(array_agg(relname::text), '{}') FROM rels)
+           END
+    FROM fp
+"""
+
+class CheckTimeout(Exception):
+    """
+    Raised when a database does not answer a check within its deadline.
+    """
+
+class ProbeClaim:
+    """
+    Decides whether a probe's worker or its deadline accounts for the probe.
+    
+    A lookup that misses its deadline is reported as timed out by the
+    monitoring thread while the abandoned worker may still finish later.
+    Whichever side claims first records the outcome with the circuit
+    breaker; the other one leaves the breaker alone.
+    """
+    __slots__ = ('claimed', '_lock')
+    
+    def __init__(self):
+        self.claimed = False
+        self._lock = threading.Lock()
+    
+    def claim(self) -> bool:
+        """
+        Claim the probe's outcome.
+        
+        Returns:
+            bool: True for the first caller only
+        """
+        with self._lock:
+            if self.claimed:
+                return False
+            self.claimed = True
+            return True
+
+# DB_CHECK_<N>_<FIELD>, the number may be sparse
+CHECK_ENV_PATTERN = re.compile(r'DB_CHECK_(\d+)_([A-Z0-9_]+)')
+
+# Settings every check accepts regardless of its database type
+COMMON_CHECK_FIELDS = ('NAME', 'TYPE', 'TABLE_NAME', 'ALERT_EMAIL_ENV', 'TIMEOUT', 'INTERVAL')
+
+def _resolve_env_reference(fields: Dict[str, str], name: str) -> Optional[str]:
+    """
+    Get a setting that may be given directly or as the name of another environment variable.
+    
+    Args:
+        fields: Configured fields of a check
+        name: Setting name, e.g. USER, resolved through USER_ENV if that is set
+        
+    Returns:
+        The setting value, or None if it is not set
+    """
+    env_name = fields.get(f"{name}_ENV")
+    if env_name:
+        return os.getenv(env_name)
+    return fields.get(name)
+
+def _describe_env_reference(fields: Dict[str, str], name: str) -> str:
+    """
+    Name where a setting resolved by _resolve_env_reference comes from, for error messages.
+    """
+    env_name = fields.get(f"{name}_ENV")
+    return f"{name} (environment variable {env_name})" if env_name else name
+
+class CheckConfig(NamedTuple):
+    """
+    Immutable configuration of one check.
+    
+    check_id indexes the state table, result history and metric arrays. It
+    is kept while the check stays loaded, and once the check is removed it
+    may be given to a new one, so it says nothing about the check's position
+    in checks_config. settings holds the driver specific connection settings
+    and is shared by all checks against the same database.
+    """
+    check_id: int
+    name: str
+    type: str
+    table_name: str
+    alert_email: str
+    timeout: float
+    interval: float
+    driver: 'BackendDriver'
+    settings: Dict
+
+def _remaining_budget(deadline: Optional[float], timeout: Optional[float]) -> Optional[float]:
+    """
+    Get the time left before a probe's deadline, for a reconnect after a dropped pooled connection.
+    
+    Args:
+        deadline: Monotonic time the probe must finish by, None for no limit
+        timeout: The probe's full timeout in seconds, for the error message
+    
+    Returns:
+        Seconds left, None if there is no deadline
+    
+    Raises:
+        CheckTimeout: If the deadline has already passed, so no reconnect is attempted
+    """
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise CheckTimeout(f"No time left to reconnect within {timeout}s")
+    return remaining
+
+async def _wait_postgres(conn) -> None:
+    """
+    Drive an asynchronous psycopg2 connection until its operation completes.
+    
+    Args:
+        conn: Connection opened with async_=True
+    """
+    loop = asyncio.get_running_loop()
+    
+    while True:
+        state = conn.poll()
+        if state == psycopg2.extensions.POLL_OK:
+            return
+        
+        fd = conn.fileno()
+        ready = loop.create_future()
+        wake = lambda: ready.done() or ready.set_result(None)
+        
+        if state == psycopg2.extensions.POLL_READ:
+            loop.add_reader(fd, wake)
+            try:
+                await ready
+            finally:
+                loop.remove_reader(fd)
+        elif state == psycopg2.extensions.POLL_WRITE:
+            loop.add_writer(fd, wake)
+            try:
+                await ready
+            finally:
+                loop.remove_writer(fd)
+        else:
+            raise psycopg2.OperationalError(f"Unexpected poll state {state}")
+
+class BackendDriver:
+    """
+    Describes how the checker handles one database type.
+    
+    A driver reads the type's connection settings, names and identifies its
+    databases by those settings, batch-resolves table names against one
+    database and owns whatever connection pools and file state it needs.
+    Drivers are registered by type name with @register_backend and created
+    once per checker, and each loaded check keeps a reference to its driver,
+    so dispatch is a single attribute lookup. To support another database,
+    subclass this (or ServerDriver for a pooled network database) and
+    register it; DatabaseTableChecker itself needs no changes.
+    """
+    name = ''
+    fields: tuple = ()  # Type specific setting names, e.g. DB_PATH for DB_CHECK_N_DB_PATH
+    
+    def __init__(self, checker: 'DatabaseTableChecker'):
+        self.checker = checker
+    
+    def load_settings(self, fields: Dict[str, str]) -> Dict:
+        """
+        Build the connection settings of a check from its configured fields.
+        
+        Args:
+            fields: Setting names without the DB_CHECK_N_ prefix mapped to their values
+        
+        Returns:
+            Dictionary of connection settings, passed back to the other methods
+        
+        Raises:
+            ValueError: If a required setting is missing or invalid
+        """
+        raise NotImplementedError
+    
+    def describe(self, settings: Dict) -> str:
+        """
+        Describe a database for logs and alert emails.
+        """
+        raise NotImplementedError
+    
+    def endpoint_key(self, settings: Dict) -> tuple:
+        """
+        Get the key identifying a database.
+        """
+        raise NotImplementedError
+    
+    def probe(self, settings: Dict, table_names: List[str], timeout: Optional[float]) -> Dict[str, bool]:
+        """
+        Look up several tables in one database with one lookup.
+        
+        Args:
+            settings: Connection settings of the database
+            table_names: Names of tables to check
+            timeout: Deadline in seconds, None for no limit
+        
+        Returns:
+            Dictionary mapping each table name to whether it exists
+        
+        Raises:
+            CheckTimeout: If the database did not answer within the deadline
+        """
+        raise NotImplementedError
+    
+    async def probe_async(self, settings: Dict, table_names: List[str],
+                          timeout: Optional[float]) -> Dict[str, bool]:
+        """
+        Look up several tables without blocking the event loop.
+        
+        Runs the blocking probe on the loop's default executor unless the
+        driver has a native asynchronous implementation.
+        """
+        return await asyncio.to_thread(self.probe, settings, table_names, timeout)
+    
+    def pools(self) -> Dict[str, ConnectionPool]:
+        """
+        Get the connection pools the driver keeps by name, for eviction, shutdown and status.
+        """
+        return {}
+    
+    def release(self, settings: Dict) -> None:
+        """
+        Free pooled connections and cached state of a database that is no longer checked.
+        """
+
+BACKENDS: Dict[str, type] = {}
+
+def register_backend(driver_class: type) -> type:
+    """
+    Class decorator that makes a BackendDriver available as DB_CHECK_N_TYPE=<name>.
+    """
+    BACKENDS[driver_class.name] = driver_class
+    return driver_class
+
+@register_backend
+class SQLiteDriver(BackendDriver):
+    """
+    SQLite database files.
+    
+    The table list is cached per file and only read from sqlite_master
+    again when the schema cookie in the file header changes, so a steady
+    state check costs a stat() and no connection.
+    """
+    name = 'sqlite'
+    fields = ('DB_PATH',)
+    
+    def __init__(self, checker: 'DatabaseTableChecker'):
+        super().__init__(checker)
+        self.file_states = {}  # Last stat() and schema fingerprint per file
+    
+    def load_settings(self, fields: Dict[str, str]) -> Dict:
+        db_path = fields.get('DB_PATH')
+        if not db_path:
+            raise ValueError("missing DB_PATH for SQLite check")
+        return {"db_path": db_path}
+    
+    def describe(self, settings: Dict) -> str:
+        return f"SQLite: {settings['db_path']}"
+    
+    def endpoint_key(self, settings: Dict) -> tuple:
+        return ('sqlite', settings['db_path'])
+    
+    def fingerprint(self, db_path: str) -> Optional[tuple]:
+        """
+        Read the schema cookie of a SQLite database without opening a connection.
+        
+        The cookie at offset 40 of the 100-byte header is incremented by every
+        schema change. Another database copied or renamed over the file may
+        carry the same cookie, so the fingerprint also holds the file's
+        device, inode, mtime and size and the header's file change counter
+        (offset 24) and version-valid-for number (offset 92). Outside WAL mode
+        every write changes the counter anyway, so this costs no extra reads
+        of sqlite_master; in WAL mode the file itself only changes when the
+        log is checkpointed. Recent schema changes may still live in the -wal
+        file, so its size and mtime are part of the fingerprint too. The
+        header is only read again when the file's stat() changed.
+        
+        Args:
+            db_path: Path to SQLite database file
+        
+        Returns:
+            Fingerprint tuple, or None if the file must be read through SQLite
+        """
+        try:
+            st = os.stat(db_path)
+        except OSError:
+            return None
+        if os.path.exists(db_path + '-journal'):
+            return None  # A write is in progress or must be rolled back first
+        
+        try:
+            wal = os.stat(db_path + '-wal')
+            wal_state = (wal.st_mtime_ns, wal.st_size) if wal.st_size else None
+        except FileNotFoundError:
+            wal_state = None
+        
+        file_state = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size, wal_state)
+        known = self.file_states.get(db_path)
+        if known is not None and known[0] == file_state:
+            return known[1]
+        
+        fd = os.open(db_path, os.O_RDONLY)
+        try:
+            header = os.pread(fd, 100, 0)
+        finally:
+            os.close(fd)
+        if len(header) < 100 or not header.startswith(b'SQLite format 3\x00'):
+            return None
+        
+        fingerprint = (file_state, header[24:28], header[40:44], header[92:96])
+        self.file_states[db_path] = (file_state, fingerprint)
+        return fingerprint
+    
+    def schema_changed(self, db_path: str) -> bool:
+        """
+        Tell whether a SQLite database may have changed since its tables were last read.
+        
+        A probe of a WAL database creates and removes the -wal and -shm
+        files itself, which the file watcher reports like any other change.
+        Comparing the fingerprint with the cached one filters out those
+        events without opening a connection. The fingerprint covers the
+        file's identity and its header's change counter, so a file renamed
+        or copied over the database always counts as changed, even with the
+        same schema cookie; so does a data-only write outside WAL mode.
+        
+        Args:
+            db_path: Path to SQLite database file, as configured
+        
+        Returns:
+            True if the database should be checked again
+        """
+        fingerprint = self.fingerprint(db_path)
+        cached = self.checker.schema_cache.get(('sqlite', db_path))
+        return fingerprint is None or cached is None or cached.fingerprint != fingerprint
+    
+    def probe(self, settings: Dict, table_names: List[str], timeout: Optional[float]) -> Dict[str, bool]:
+        """
+        Check which of several tables exist in a SQLite database.
+        
+        Raises:
+            CheckTimeout: If the database stayed locked or the query ran past the timeout
+            sqlite3.Error: If the database cannot be read
+        """
+        db_path = settings['db_path']
+        schema_cache = self.checker.schema_cache
+        key = ('sqlite', db_path)
+        fingerprint = self.fingerprint(db_path)
+        cached = schema_cache.get(key)
+        if fingerprint is not None and cached is not None and cached.fingerprint == fingerprint:
+            schema_cache.reused()
+            return {table_name: table_name in cached.tables for table_name in table_names}
+        
+        deadline = time.monotonic() + timeout if timeout else None
+        connect_started = time.perf_counter()
+        conn = sqlite3.connect(db_path, timeout=timeout or 5.0)
+        record_connect(connect_started)
+        try:
+            if deadline:
+                # Abort the query once the deadline has passed
+                conn.set_progress_handler(lambda: time.monotonic() > deadline, 1000)
+            cursor = conn.cursor()
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            existing = {row[0] for row in cursor.fetchall()}
+        except sqlite3.OperationalError as e:
+            if deadline and time.monotonic() >= deadline:
+                raise CheckTimeout(f"No answer within {timeout}s ({e})") from e
+            raise
+        finally:
+            conn.close()
+        
+        if fingerprint is not None:
+            # Read before sqlite_master, so a concurrent change only causes an extra refresh
+            schema_cache.put(key, fingerprint, existing)
+        
+        return {table_name: table_name in existing for table_name in table_names}
+    
+    def release(self, settings: Dict) -> None:
+        self.checker.schema_cache.invalidate(('sqlite', settings['db_path']))
+        self.file_states.pop(settings['db_path'], None)
+
+class ServerDriver(BackendDriver):
+    """
+    Base for database servers reached by host, port, database and credentials.
+    
+    Connections are pooled per (host, port, database, user) in pools the
+    driver owns. Subclasses implement connect() and lookup(); probe() takes
+    a pooled connection or opens one, runs the lookup and returns the
+    connection to the pool. A pooled connection the server has dropped is
+    replaced once, within what is left of the deadline.
+    """
+    label = ''
+    default_port = 0
+    fields = ('HOST', 'PORT', 'DATABASE', 'USER', 'USER_ENV', 'PASSWORD', 'PASSWORD_ENV')
+    dropped_errors: tuple = ()  # Errors of lookup() that mean the connection is gone
+    
+    def __init__(self, checker: 'DatabaseTableChecker'):
+        super().__init__(checker)
+        self.pool = self.create_pool()
+    
+    def create_pool(self) -> ConnectionPool:
+        """
+        Create a connection pool sized by CHECK_MAX_PER_ENDPOINT and POOL_MAX_IDLE.
+        """
+        return ConnectionPool(self.usable, lambda conn: conn.close(),
+                              max_idle=self.checker.pool_max_idle, max_size=self.checker.max_per_endpoint)
+    
+    def usable(self, conn) -> bool:
+        """
+        Check locally, without a round-trip, whether an idle pooled connection can be reused.
+        
+        Without a local check a dropped connection is only noticed, and
+        replaced, when the lookup fails on it.
+        """
+        return True
+    
+    def connect(self, settings: Dict, timeout: Optional[float]):
+        """
+        Open a connection for the pool.
+        
+        Args:
+            settings: Connection settings of the database
+            timeout: Connect timeout in seconds, None for no limit
+        
+        Returns:
+            The open connection
+        
+        Raises:
+            CheckTimeout: If connecting ran past the timeout
+        """
+        raise NotImplementedError
+    
+    def lookup(self, conn, settings: Dict, table_names: List[str], timeout: Optional[float]) -> Set[str]:
+        """
+        Find which tables exist over an open connection with one query.
+        
+        Args:
+            conn: Pooled or freshly opened connection
+            settings: Connection settings of the database
+            table_names: Names of tables to check
+            timeout: Query timeout in seconds, None for no limit
+        
+        Returns:
+            Names of existing tables, at least those of table_names that exist
+        
+        Raises:
+            CheckTimeout: If the query ran past the timeout
+        """
+        raise NotImplementedError
+    
+    def load_settings(self, fields: Dict[str, str]) -> Dict:
+        host = fields.get('HOST')
+        database = fields.get('DATABASE')
+        try:
+            port = int(fields.get('PORT', self.default_port))
+        except ValueError:
+            raise ValueError(f"invalid PORT '{fields['PORT']}'")
+        
+        # Get user and password from their own environment variables
+        user = _resolve_env_reference(fields, 'USER')
+        password = _resolve_env_reference(fields, 'PASSWORD')
+        
+        missing = [name for name, value in (('HOST', host), ('DATABASE', database),
+                                            (_describe_env_reference(fields, 'USER'), user),
+                                            (_describe_env_reference(fields, 'PASSWORD'), password)) if not value]
+        if missing:
+            raise ValueError(f"missing {self.label} credentials: {', '.join(missing)}")
+        
+        return {
+            "host": host,
+            "port": port,
+            "database": database,
+            "user": user,
+            "password": password
+        }
+    
+    def describe(self, settings: Dict) -> str:
+        return f"{self.label}: {settings['host']}:{settings['port']}/{settings['database']}"
+    
+    def endpoint_key(self, settings: Dict) -> tuple:
+        return (self.name, settings['host'], settings['port'],
+                settings['database'], settings['user'])
+    
+    def pool_key(self, settings: Dict) -> tuple:
+        """
+        Get the key of a database's pooled connections and cached schema.
+        """
+        return (settings['host'], settings['port'], settings['database'], settings['user'])
+    
+    def probe(self, settings: Dict, table_names: List[str], timeout: Optional[float]) -> Dict[str, bool]:
+        return self.pooled_probe(self.pool, settings, table_names, timeout, self.connect, self.lookup)
+    
+    def pooled_probe(self, pool: ConnectionPool, settings: Dict, table_names: List[str],
+                     timeout: Optional[float], connect: Callable, lookup: Callable) -> Dict[str, bool]:
+        """
+        Run a lookup on a pooled connection, replacing a dropped one once.
+        
+        Args:
+            pool: Pool to take the connection from and return it to
+            settings: Connection settings of the database
+            table_names: Names of tables to check
+            timeout: Deadline in seconds for connecting and the lookup together
+            connect: Opens a connection, called as connect(settings, timeout)
+            lookup: Runs the lookup, called as lookup(conn, settings, table_names, timeout)
+        
+        Returns:
+            Dictionary mapping each table name to whether it exists
+        """
+        key = self.pool_key(settings)
+        deadline = time.monotonic() + timeout if timeout else None
+        budget = timeout
+        
+        for attempt in range(2):
+            conn = pool.take(key)
+            reused = conn is not None
+            if conn is None:
+                connect_started = time.perf_counter()
+                try:
+                    conn = connect(settings, budget)
+                finally:
+                    record_connect(connect_started)
+                pool.opened()
+            
+            try:
+                existing = lookup(conn, settings, table_names, budget)
+            except self.dropped_errors:
+                pool.discard(conn)
+                if reused and attempt == 0:
+                    # The server dropped the pooled connection, reconnect once within what is left of the deadline
+                    budget = _remaining_budget(deadline, timeout)
+                    logger.info(f"Reconnecting to {self.describe(settings)}")
+                    continue
+                raise
+            except BaseException:
+                pool.discard(conn)
+                raise
+            
+            pool.put(key, conn)
+            return {table_name: table_name in existing for table_name in table_names}
+    
+    async def pooled_probe_async(self, pool: ConnectionPool, settings: Dict, table_names: List[str],
+                                 timeout: Optional[float], connect: Callable, lookup: Callable) -> Dict[str, bool]:
+        """
+        Run a lookup on a pooled connection without blocking the event loop.
+        
+        Works like pooled_probe with coroutine connect and lookup callables.
+        A cancelled lookup leaves its connection mid-query, so it is discarded.
+        """
+        key = self.pool_key(settings)
+        deadline = time.monotonic() + timeout if timeout else None
+        budget = timeout
+        
+        for attempt in range(2):
+            conn = pool.take(key)
+            reused = conn is not None
+            if conn is None:
+                connect_started = time.perf_counter()
+                try:
+                    conn = await connect(settings, budget)
+                finally:
+                    record_connect(connect_started)
+                pool.opened()
+            
+            try:
+                existing = await lookup(conn, settings, table_names, budget)
+            except self.dropped_errors:
+                pool.discard(conn)
+                if reused and attempt == 0:
+                    # The server dropped the pooled connection, reconnect once within what is left of the deadline
+                    budget = _remaining_budget(deadline, timeout)
+                    logger.info(f"Reconnecting to {self.describe(settings)}")
+                    continue
+                raise
+            except BaseException:
+                pool.discard(conn)
+                raise
+            
+            pool.put(key, conn)
+            return {table_name: table_name in existing for table_name in table_names}
+    
+    def pools(self) -> Dict[str, ConnectionPool]:
+        return {self.name: self.pool}
+    
+    def release(self, settings: Dict) -> None:
+        key = self.pool_key(settings)
+        for pool in self.pools().values():
+            pool.close_endpoint(key)
+        self.checker.schema_cache.invalidate(key)
+
+@register_backend
+class PostgresDriver(ServerDriver):
+    """
+    PostgreSQL databases.
+    
+    The table list is cached per database and only transferred again when
+    the catalog fingerprint changes, so a steady state check is a single
+    round-trip on a pooled connection. The asyncio engine uses psycopg2's
+    asynchronous mode with a pool of its own, as asynchronous and blocking
+    connections cannot be mixed.
+    """
+    name = 'postgres'
+    label = 'PostgreSQL'
+    default_port = 5432
+    dropped_errors = (psycopg2.OperationalError, psycopg2.InterfaceError)
+    
+    def __init__(self, checker: 'DatabaseTableChecker'):
+        super().__init__(checker)
+        self.async_pool = self.create_pool()
+    
+    def usable(self, conn) -> bool:
+        return (conn.closed == 0 and
+                conn.get_transaction_status() == psycopg2.extensions.TRANSACTION_STATUS_IDLE)
+    
+    def timeout_args(self, timeout: Optional[float]) -> Dict:
+        """
+        Get libpq connection arguments that bound how long a connection can hang.
+        
+        Args:
+            timeout: Check timeout in seconds, None for no limit
+        
+        Returns:
+            Dictionary of extra psycopg2.connect keyword arguments
+        """
+        if not timeout:
+            return {}
+        return {
+            'connect_timeout': max(2, math.ceil(timeout)),  # libpq rounds anything below 2s up to 2s
+            'tcp_user_timeout': int(timeout * 1000)  # Give up on a blackholed connection mid-query
+        }
+    
+    def snapshot_tables(self, key: tuple, cached: Optional[SchemaSnapshot], row: tuple) -> FrozenSet[str]:
+        """
+        Resolve the table set of a database from a schema snapshot query result.
+        
+        Args:
+            key: Pool key of the database
+            cached: Snapshot whose fingerprint was sent with the query
+            row: (fingerprint, table names or None if unchanged)
+        
+        Returns:
+            Names of the relations in the public schema
+        """
+        fingerprint, names = row
+        if names is None:
+            self.checker.schema_cache.reused()
+            return cached.tables
+        return self.checker.schema_cache.put(key, fingerprint, names).tables
+    
+    def connect(self, settings: Dict, timeout: Optional[float]):
+        try:
+            conn = psycopg2.connect(
+                host=settings['host'],
+                database=settings['database'],
+                user=settings['user'],
+                password=settings['password'],
+                port=settings['port'],
+                **self.timeout_args(timeout)
+            )
+        except psycopg2.OperationalError as e:
+            if 'timeout expired' in str(e):
+                raise CheckTimeout(f"Connect timed out after {timeout}s") from e
+            raise
+        conn.autocommit = True  # Never leave pooled connections idle in transaction
+        return conn
+    
+    def lookup(self, conn, settings: Dict, table_names: List[str], timeout: Optional[float]) -> FrozenSet[str]:
+        key = self.pool_key(settings)
+        cached = self.checker.schema_cache.get(key)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(POSTGRES_SCHEMA_SNAPSHOT_QUERY,
+                               (int((timeout or 0) * 1000), cached.fingerprint if cached else None))
+                return self.snapshot_tables(key, cached, cursor.fetchone())
+        except psycopg2.extensions.QueryCanceledError as e:
+            raise CheckTimeout(f"Query timed out after {timeout}s") from e
+    
+    async def connect_async(self, settings: Dict, timeout: Optional[float]):
+        """
+        Open an asynchronous connection, multiplexed on the event loop instead of holding a thread.
+        """
+        conn = psycopg2.connect(
+            host=settings['host'],
+            database=settings['database'],
+            user=settings['user'],
+            password=settings['password'],
+            port=settings['port'],
+            async_=True,
+            **self.timeout_args(timeout)
+        )
+        try:
+            await _wait_postgres(conn)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+    
+    async def lookup_async(self, conn, settings: Dict, table_names: List[str],
+                           timeout: Optional[float]) -> FrozenSet[str]:
+        """
+        Run the schema snapshot query on an asynchronous connection.
+        """
+        key = self.pool_key(settings)
+        cached = self.checker.schema_cache.get(key)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(POSTGRES_SCHEMA_SNAPSHOT_QUERY,
+                           (int((timeout or 0) * 1000), cached.fingerprint if cached else None))
+            await _wait_postgres(conn)
+            existing = self.snapshot_tables(key, cached, cursor.fetchone())
+        except psycopg2.extensions.QueryCanceledError as e:
+            raise CheckTimeout(f"Query timed out after {timeout}s") from e
+        cursor.close()
+        return existing
+    
+    async def probe_async(self, settings: Dict, table_names: List[str],
+                          timeout: Optional[float]) -> Dict[str, bool]:
+        return await self.pooled_probe_async(self.async_pool, settings, table_names, timeout,
+                                             self.connect_async, self.lookup_async)
+    
+    def pools(self) -> Dict[str, ConnectionPool]:
+        return {'postgres': self.pool, 'postgres_async': self.async_pool}
+
+@register_backend
+class MySQLDriver(ServerDriver):
+    """
+    MySQL databases, connected with database_utils.create_mysql_connection.
+    
+    MySQL connections have no local liveness check, so a dropped pooled
+    connection is noticed and replaced when the lookup fails on it.
+    mysql-connector-python has no asyncio driver in the pinned version, so
+    the asyncio engine runs the blocking probe on the loop's default executor.
+    """
+    name = 'mysql'
+    label = 'MySQL'
+    default_port = 3306
+    fields = ServerDriver.fields + ('SSL_CA', 'SSL_DISABLED')
+    dropped_errors = (mysql.connector.OperationalError, mysql.connector.InterfaceError)
+    
+    def load_settings(self, fields: Dict[str, str]) -> Dict:
+        settings = super().load_settings(fields)
+        settings.update({
+            "ssl_ca": fields.get('SSL_CA', ""),
+            "ssl_disabled": fields.get('SSL_DISABLED', "false")
+        })
+        return settings
+    
+    def connect(self, settings: Dict, timeout: Optional[float]):
+        try:
+            conn = create_mysql_connection({
+                **settings,
+                'connect_timeout': max(1, math.ceil(timeout)) if timeout else None
+            }, raise_on_error=True)
+        except mysql.connector.Error as e:
+            if 'timed out' in str(e):
+                raise CheckTimeout(f"Connect timed out after {timeout}s") from e
+            raise
+        conn.autocommit = True  # Never leave pooled connections idle in transaction
+        return conn
+    
+    def lookup(self, conn, settings: Dict, table_names: List[str], timeout: Optional[float]) -> Set[str]:
+        try:
+            return existing_tables(conn, table_names)
+        except self.dropped_errors as e:
+            if 'timed out' in str(e):
+                raise CheckTimeout(f"Query timed out after {timeout}s") from e
+            raise
+
 class DatabaseTableChecker:
     def __init__(self):
         """
         Initialize the checker with configuration from environment variables.
         """
-        # Load Gmail credentials from environment
-        self.gmail_user = self._get_required_env('GMAIL_USER')
-        self.gmail_password = self._get_required_env('GMAIL_APP_PASSWORD')
-        self.gmail_sender = self.gmail_user  # Sender is the same as the Gmail user
+        # Load Gmail credentials from environment
+        self.gmail_user = self._get_required_env('GMAIL_USER')
+        self.gmail_password = self._get_required_env('GMAIL_APP_PASSWORD')
+        self.gmail_sender = self.gmail_user  # Sender is the same as the Gmail user
+        
+        # Prometheus metrics, allocated per check as checks are loaded and served on /metrics
+        self.metrics = CheckMetrics()
+        
+        # Deliver alerts from a background thread over a reusable SMTP session
+        self.alert_sender = AlertSender(
+            self.gmail_user,
+            self.gmail_password,
+            host=os.getenv('SMTP_HOST', 'smtp.gmail.com'),
+            port=int(os.getenv('SMTP_PORT', '587')),
+            starttls=os.getenv('SMTP_STARTTLS', 'true').lower() == 'true',
+            idle_timeout=int(os.getenv('SMTP_IDLE_TIMEOUT', '60')),
+            max_queue=int(os.getenv('ALERT_QUEUE_SIZE', '1000')),
+            observer=self.metrics.observe_smtp
+        )
+        
+        # Coalesce alerts per recipient: 'off', 'cycle' or a window in seconds
+        self.alert_digest = os.getenv('ALERT_DIGEST', 'off').lower()
+        if self.alert_digest not in ('off', 'cycle'):
+            try:
+                if float(self.alert_digest) <= 0:
+                    raise ValueError
+            except ValueError:
+                raise ValueError(f"Invalid ALERT_DIGEST '{self.alert_digest}', use 'off', 'cycle' or seconds")
+        self.pending_alerts = {}
+        self.digest_lock = threading.Lock()
+        self.digest_timer = None
+        
+        # Load monitoring settings from environment
+        self.check_interval = self._get_positive_env('CHECK_INTERVAL', '300')  # Default: 5 minutes
+        self.check_jitter = float(os.getenv('CHECK_JITTER', '0.1'))  # Default: up to 10% of the interval
+        self.alert_cooldown = int(os.getenv('ALERT_COOLDOWN', '3600'))  # Default: 1 hour
+        self.check_timeout = self._get_positive_env('CHECK_TIMEOUT', '10')  # Default: 10 seconds per check
+        
+        # Load concurrency settings from environment
+        self.max_workers = max(1, int(os.getenv('CHECK_MAX_WORKERS', '8')))  # 1 = run checks sequentially
+        self.max_per_endpoint = max(1, int(os.getenv('CHECK_MAX_PER_ENDPOINT', '2')))  # Pooled connections per database
+        self.executor = None
+        
+        # Select the check engine: 'threads' (worker pool) or 'asyncio' (single event loop)
+        self.engine = os.getenv('CHECK_ENGINE', 'threads').lower()
+        if self.engine not in ('threads', 'asyncio'):
+            raise ValueError(f"Unsupported CHECK_ENGINE '{self.engine}', use 'threads' or 'asyncio'")
+        self.max_async_checks = max(1, int(os.getenv('CHECK_ASYNC_CONCURRENCY', '200')))
+        
+        # Close pooled connections idle for longer, the pools themselves belong to the backend drivers
+        self.pool_max_idle = int(os.getenv('POOL_MAX_IDLE', '600'))  # Default: 10 minutes
+        
+        # Cache the table list of each database until its catalog fingerprint changes
+        self.schema_cache = SchemaCache()
+
+        # Optionally re-check SQLite databases as soon as their files change: 'off' or 'inotify'
+        self.sqlite_watch = os.getenv('SQLITE_WATCH', 'off').lower()
+        if self.sqlite_watch not in ('off', 'inotify'):
+            raise ValueError(f"Unsupported SQLITE_WATCH '{self.sqlite_watch}', use 'off' or 'inotify'")
+        self.sqlite_watch_debounce = float(os.getenv('SQLITE_WATCH_DEBOUNCE', '0.5'))
+        self.sqlite_watcher = None
+        
+        # Optionally re-check PostgreSQL databases when their DDL event trigger notifies:
+        # 'off', 'listen' (trigger installed by an admin) or 'install' (create it, needs superuser)
+        self.postgres_watch = os.getenv('POSTGRES_WATCH', 'off').lower()
+        if self.postgres_watch not in ('off', 'listen', 'install'):
+            raise ValueError(f"Unsupported POSTGRES_WATCH '{self.postgres_watch}', use 'off', 'listen' or 'install'")
+        self.postgres_watch_channel = os.getenv('POSTGRES_WATCH_CHANNEL', DEFAULT_CHANNEL)
+        self.postgres_listener = None
+        
+        # Initialize monitoring state
+        self.is_running = False
+        self.check_thread = None
+        self.scheduler = CheckScheduler(jitter=self.check_jitter)
+        self.wake_event = threading.Event()  # Wakes the monitoring loop early
+        self.loop = None  # Event loop of the asyncio engine while it runs
+        self.async_wake = None
+        self.checks_config: List[CheckConfig] = []
+        self.checks_by_id: Dict[int, CheckConfig] = {}
+        self.next_check_id = 0  # Number of check IDs allocated so far
+        self.free_check_ids: List[int] = []  # Heap of released IDs, the lowest is reused first
+        self.check_state = CheckStateTable()  # Last run, result and alert per check ID
+        self.reload_lock = threading.Lock()
+        
+        # Optionally persist check state so alert cooldowns survive restarts (needs a persistent volume)
+        self.state_db = os.getenv('STATE_DB')
+        self.state_flush_interval = float(os.getenv('STATE_FLUSH_INTERVAL', '5'))  # Batch state writes per N seconds
+        self.state_store = None
+        self.state_keys: Dict[int, str] = {}  # Check ID -> stable key of its stored state
+        self.state_flushed_at = 0.0
+        self.state_flush_lock = threading.Lock()
+        self.state_flush_timer = None  # Writes changes that arrive within the flush interval once it has passed
+        self.unsaved_history: List[tuple] = []  # Spilled results a failed write left behind, retried next time
+        if self.state_db:
+            try:
+                self.state_store = StateStore(self.state_db)
+            except sqlite3.Error as e:
+                logger.error(f"Cannot open state database {self.state_db}, state is kept in memory only: {e}")
+        
+        # Keep the last results of each check with their latency; optionally append them to STATE_DB too
+        self.history_size = max(1, int(os.getenv('HISTORY_SIZE', '60')))  # Results kept in memory per check
+        self.history_spill = os.getenv('HISTORY_SPILL', 'false').lower() == 'true'
+        self.history_retention = float(os.getenv('HISTORY_RETENTION_DAYS', '7')) * 86400
+        if self.history_spill and self.state_store is None:
+            logger.warning("HISTORY_SPILL needs STATE_DB, check history is kept in memory only")
+        self.check_history = CheckHistory(self.history_size, spill=self.history_spill and self.state_store is not None)
+        self.history_pruned_at = 0.0
+        
+        # Serve status JSON and an HTML dashboard when the platform assigns a PORT (Procfile web process)
+        self.status_port = int(os.getenv('PORT', '0'))  # 0 = no HTTP server
+        # The status names database hosts, tables and errors, so only serve it publicly behind a token
+        self.status_token = os.getenv('STATUS_TOKEN') or None
+        self.status_host = os.getenv('STATUS_HOST', '0.0.0.0' if self.status_token else '127.0.0.1')
+        if self.status_port and not self.status_token and self.status_host not in ('127.0.0.1', '::1', 'localhost'):
+            raise ValueError(f"STATUS_HOST={self.status_host} would serve the status without authentication, "
+                             f"set STATUS_TOKEN or bind to 127.0.0.1")
+        if self.status_port and not self.status_token:
+            logger.warning(f"Serving status on {self.status_host} only, set STATUS_TOKEN to make it reachable from outside")
+        self.status_snapshot_interval = float(os.getenv('STATUS_SNAPSHOT_INTERVAL', '1'))  # Re-render at most every N seconds
+        self.status_snapshot: Optional[StatusSnapshot] = None
+        self.status_published_at = 0.0
+        self.status_publish_lock = threading.Lock()
+        self.status_publish_timer = None  # Pending render, the snapshot is stale while it is set
+        self.status_render_lock = threading.Lock()  # One render at a time, so an older one never replaces a newer one
+        self.status_server = None
+        
+        # Push each check result to /events subscribers; slow ones get coalesced or dropped events
+        self.events = EventBroadcaster(
+            max_pending=max(1, int(os.getenv('STREAM_BUFFER_SIZE', '1000'))),
+            max_subscribers=int(os.getenv('STREAM_MAX_SUBSCRIBERS', '20'))
+        )
+        
+        # Load default alert email address
+        self.default_alert_email = os.getenv('DEFAULT_ALERT_EMAIL')
+        
+        # Load database checks from environment and batch them per database
+        self.backends = {name: driver_class(self) for name, driver_class in BACKENDS.items()}
+        self.checks_file = os.getenv('CHECKS_FILE')  # Optional JSON, JSON Lines, TOML or YAML catalog
+        self.checks_file_poll = float(os.getenv('CHECKS_FILE_POLL', '0'))  # Reload when its mtime changes, 0 = off
+        self.checks_file_mtime = None
+        self.config_watch_stop = threading.Event()
+        self.config_watch_thread = None
+        self.check_groups = {}
+        
+        # Short-circuit endpoints that keep failing, probing them with exponential backoff
+        self.breaker_threshold = int(os.getenv('BREAKER_FAILURE_THRESHOLD', '3'))
+        self.breaker_backoff = float(os.getenv('BREAKER_BACKOFF', '60'))  # Default: first probe after 1 minute
+        self.breaker_max_backoff = float(os.getenv('BREAKER_MAX_BACKOFF', '3600'))  # Default: at most 1 hour
+        self.breakers = {}
+        
+        checks = self._load_checks_from_env()
+        if self.checks_file:
+            self.checks_file_mtime = self._checks_file_mtime()
+            try:
+                checks += self._load_checks_from_file(self.checks_file)
+            except (OSError, ValueError) as e:
+                logger.error(f"Could not load check catalog {self.checks_file}: {e}")
+        self._apply_checks(checks)
+        
+        logger.info(f"Initialized checker with {len(self.checks_config)} checks")
+    
+    def _get_required_env(self, var_name: str) -> str:
+        """
+        Get a required environment variable or raise an error.
+        
+        Args:
+            var_name: Name of the environment variable
+            
+        Returns:
+            The environment variable value
+            
+        Raises:
+            ValueError: If the environment variable is not set
+        """
+        value = os.getenv(var_name)
+        if not value:
+            raise ValueError(f"Required environment variable {var_name} is not set")
+        return value
+    
+    def _get_positive_env(self, var_name: str, default: str) -> float:
+        """
+        Get an environment variable that must be a positive number of seconds.
+        
+        Args:
+            var_name: Name of the environment variable
+            default: Value used if the variable is not set
+        
+        Returns:
+            The value as a number
+        
+        Raises:
+            ValueError: If the value is not a positive number
+        """
+        value = os.getenv(var_name, default)
+        try:
+            number = float(value)
+        except ValueError:
+            number = 0
+        if not number > 0:
+            raise ValueError(f"Invalid {var_name} '{value}', use a positive number of seconds")
+        return number
+    
+    def _load_checks_from_env(self) -> List[CheckConfig]:
+        """
+        Load database checks from environment variables.
+        
+        Environment variables should follow the pattern:
+        DB_CHECK_1_NAME=User Sessions Table
+        DB_CHECK_1_TYPE=sqlite
+        DB_CHECK_1_DB_PATH=/app/data/sessions.db
+        DB_CHECK_1_TABLE_NAME=user_sessions
+        DB_CHECK_1_ALERT_EMAIL_ENV=ALERT_EMAIL_ADMIN
+        
+        For PostgreSQL:
+        DB_CHECK_2_NAME=Orders Table
+        DB_CHECK_2_TYPE=postgres
+        DB_CHECK_2_HOST=localhost
+        DB_CHECK_2_PORT=5432
+        DB_CHECK_2_DATABASE=myapp
+        DB_CHECK_2_USER_ENV=DB_USER
+        DB_CHECK_2_PASSWORD_ENV=DB_PASSWORD
+        DB_CHECK_2_TABLE_NAME=orders
+        DB_CHECK_2_ALERT_EMAIL_ENV=ALERT_EMAIL_DEV
+        DB_CHECK_2_TIMEOUT=5
+        DB_CHECK_2_INTERVAL=15
+        
+        For MySQL, the same as PostgreSQL with TYPE=mysql (PORT defaults to 3306) plus:
+        DB_CHECK_3_SSL_CA=./ca-certificate.crt
+        DB_CHECK_3_SSL_DISABLED=false
+        
+        If ALERT_EMAIL_ENV is not specified, uses DEFAULT_ALERT_EMAIL
+        If TIMEOUT is not specified, uses CHECK_TIMEOUT
+        If INTERVAL is not specified, uses CHECK_INTERVAL
+        
+        Check numbers do not have to be consecutive; checks are loaded in
+        numeric order. The environment is scanned once and every invalid
+        check is reported in a single error before it is skipped.
+        
+        Returns:
+            Loaded checks, without check IDs assigned yet
+        """
+        # Collect DB_CHECK_<N>_<FIELD> variables per check number in one pass
+        check_fields: Dict[int, Dict[str, str]] = {}
+        for key, value in os.environ.items():
+            match = CHECK_ENV_PATTERN.fullmatch(key)
+            if match:
+                check_fields.setdefault(int(match.group(1)), {})[match.group(2)] = value
+        
+        checks = []
+        shared_settings = {}
+        errors = []
+        for check_num in sorted(check_fields):
+            source = f"DB_CHECK_{check_num}"
+            try:
+                check_config = self._build_check(check_fields[check_num], source, shared_settings)
+            except ValueError as e:
+                errors.append(f"{source}: {e}")
+                continue
+            checks.append(check_config)
+            logger.info(f"Loaded check {check_num}: {check_config.name} ({check_config.type})")
+        
+        self._report_config_errors(errors)
+        return checks
+    
+    def _load_checks_from_file(self, path: str) -> List[CheckConfig]:
+        """
+        Load database checks from a catalog file.
+        
+        Each entry uses the DB_CHECK_N_* field names in any case, e.g.
+        {"name": "Orders", "type": "postgres", "host": "db", "database": "app",
+         "user_env": "PG_USER", "password_env": "PG_PASS", "table_name": "orders"}
+        Credentials should be referenced through *_ENV names so the file
+        holds no secrets. JSON Lines and JSON arrays are streamed.
+        
+        Args:
+            path: Path of the catalog file (.json, .jsonl, .ndjson, .toml, .yaml, .yml)
+            
+        Returns:
+            Loaded checks, without check IDs assigned yet
+            
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is malformed, invalid entries are only skipped
+        """
+        started = time.perf_counter()
+        checks = []
+        shared_settings = {}
+        errors = []
+        inline_passwords = 0
+        
+        for source, entry in iter_check_catalog(path):
+            try:
+                fields = catalog_fields(entry)
+                check_config = self._build_check(fields, source, shared_settings)
+            except ValueError as e:
+                errors.append(f"{source}: {e}")
+                continue
+            inline_passwords += 'PASSWORD' in fields
+            checks.append(check_config)
+        
+        logger.info(f"Loaded {len(checks)} checks from {path} in {time.perf_counter() - started:.2f}s")
+        if inline_passwords:
+            logger.warning(f"{inline_passwords} checks in {path} contain a plain PASSWORD, "
+                           f"use PASSWORD_ENV to keep secrets out of the catalog")
+        self._report_config_errors(errors)
+        return checks
+    
+    def _report_config_errors(self, errors: List[str], limit: int = 50) -> None:
+        """
+        Log all configuration errors found while loading checks in one message.
+        
+        Args:
+            errors: One message per rejected check
+            limit: Maximum number of messages to list
+        """
+        if not errors:
+            return
+        listed = "\n  ".join(errors[:limit])
+        more = f"\n  ... and {len(errors) - limit} more" if len(errors) > limit else ""
+        logger.error(f"Skipped {len(errors)} invalid checks:\n  {listed}{more}")
+    
+    def _build_check(self, fields: Dict[str, str], source: str, shared_settings: Dict) -> CheckConfig:
+        """
+        Validate the fields of one check and build its configuration.
+        
+        Args:
+            fields: Setting names without the DB_CHECK_N_ prefix mapped to their values
+            source: Where the check is configured, for warnings
+            shared_settings: Driver settings built so far, so checks against
+                the same database share one settings dictionary
+            
+        Returns:
+            The check configuration, its check ID is assigned by _apply_checks
+            
+        Raises:
+            ValueError: If the check is incomplete or invalid, listing every problem found
+        """
+        problems = []
+        name = fields.get('NAME')
+        check_type = fields.get('TYPE')
+        table_name = fields.get('TABLE_NAME')
+        
+        for field, value in (('NAME', name), ('TYPE', check_type), ('TABLE_NAME', table_name)):
+            if not value:
+                problems.append(f"missing {field}")
+        
+        # Get alert email from environment variable
+        alert_email_env = fields.get('ALERT_EMAIL_ENV')
+        if alert_email_env:
+            alert_email = os.getenv(alert_email_env)
+            if not alert_email:
+                problems.append(f"alert email environment variable '{alert_email_env}' not set")
+        else:
+            # Fall back to default alert email
+            alert_email = self.default_alert_email
+            if not alert_email:
+                problems.append("no ALERT_EMAIL_ENV and no DEFAULT_ALERT_EMAIL set")
+        
+        limits = {}
+        for field, default in (('TIMEOUT', self.check_timeout), ('INTERVAL', self.check_interval)):
+            value = fields.get(field, default)
+            try:
+                limits[field] = float(value)
+                if limits[field] <= 0:
+                    raise ValueError
+            except ValueError:
+                problems.append(f"invalid {field} '{value}'")
+        
+        driver = self.backends.get(check_type) if check_type else None
+        if check_type and driver is None:
+            problems.append(f"unsupported database type '{check_type}'")
+        settings = None
+        if driver is not None:
+            try:
+                settings = driver.load_settings(fields)
+            except ValueError as e:
+                problems.append(str(e))
+            
+            unknown = set(fields) - set(COMMON_CHECK_FIELDS) - set(driver.fields)
+            if unknown:
+                logger.warning(f"{source}: ignoring unknown settings {', '.join(sorted(unknown))}")
+        
+        if problems:
+            raise ValueError("; ".join(problems))
+        
+        # Checks against the same database share one settings dictionary
+        settings = shared_settings.setdefault((check_type, tuple(sorted(settings.items()))), settings)
+        
+        return CheckConfig(
+            check_id=-1,
+            name=name,
+            type=check_type,
+            table_name=table_name,
+            alert_email=alert_email,
+            timeout=limits['TIMEOUT'],
+            interval=limits['INTERVAL'],
+            driver=driver,
+            settings=settings
+        )
+    
+    def print_env_template(self) -> None:
+        """
+        Print a template of required environment variables.
+        """
+        template = """
+# Database Table Checker Environment Variables Template
+# Copy this to your .env file and fill in the values
+
+# Gmail Configuration (Required)
+GMAIL_USER=your.email@gmail.com
+# GMAIL_APP_PASSWORD=your_gmail_app_password  # Generate this in your Google Account settings
+
+# Default Alert Email (Optional - used when no specific alert email is set)
+DEFAULT_ALERT_EMAIL=alerts@example.com
+
+# SMTP Settings (Optional - defaults to Gmail)
+SMTP_HOST=smtp.gmail.com
+SMTP_PORT=587
+SMTP_STARTTLS=true          # Set to false for a local SMTP relay without TLS
+SMTP_IDLE_TIMEOUT=60        # Close the SMTP session after this many idle seconds
+ALERT_QUEUE_SIZE=1000       # Maximum alerts waiting to be sent
+ALERT_DIGEST=off            # 'off', 'cycle' (one email per recipient per cycle) or a window in seconds
+
+# Monitoring Settings (Optional)
+CHECK_INTERVAL=300          # Check interval in seconds (default: 300 = 5 minutes)
+CHECK_JITTER=0.1            # Random delay per run as a fraction of the interval (default: 0.1)
+ALERT_COOLDOWN=3600         # Alert cooldown in seconds (default: 3600 = 1 hour)
+CHECK_TIMEOUT=10            # Connect and query deadline per check in seconds (default: 10)
+CHECK_MAX_WORKERS=8         # Checks run in parallel (default: 8, set to 1 for sequential)
+CHECK_MAX_PER_ENDPOINT=2    # Pooled connections kept per database (default: 2)
+CHECK_ENGINE=threads        # 'threads' (worker pool) or 'asyncio' (single event loop)
+CHECK_ASYNC_CONCURRENCY=200 # Checks in flight at once with CHECK_ENGINE=asyncio
+POOL_MAX_IDLE=600           # Close pooled database connections idle this long (default: 600 seconds)
+BREAKER_FAILURE_THRESHOLD=3 # Consecutive failures before a database is skipped (default: 3)
+BREAKER_BACKOFF=60          # Seconds before the first retry of a skipped database (default: 60)
+BREAKER_MAX_BACKOFF=3600    # Retry backoff doubles up to this many seconds (default: 3600)
+SQLITE_WATCH=off            # 'inotify' re-checks SQLite databases as soon as their files change (Linux only)
+SQLITE_WATCH_DEBOUNCE=0.5   # Seconds a database file must be quiet before it is re-checked
+POSTGRES_WATCH=off          # 'listen' re-checks PostgreSQL databases on DDL notifications, 'install' also creates the event trigger (superuser)
+POSTGRES_WATCH_CHANNEL=db_table_checker_ddl  # NOTIFY channel used by the DDL event trigger
+
+# HTTP Status (Optional - PORT is set by the platform for the web process)
+# PORT=8080                 # Serve / (dashboard), /status, /checks, /checks/<id>, /metrics, /events and /health
+# STATUS_TOKEN=change-me    # Required for every route but /health, as "Authorization: Bearer <token>" or ?token=<token>
+STATUS_HOST=127.0.0.1       # Default: 0.0.0.0 with STATUS_TOKEN, else 127.0.0.1; a public interface needs STATUS_TOKEN
+STREAM_BUFFER_SIZE=1000     # Results buffered per /events subscriber, slow ones keep the latest per check
+STREAM_MAX_SUBSCRIBERS=20   # Concurrent /events streams
+STATUS_SNAPSHOT_INTERVAL=1  # Re-render the served status at most every N seconds
+
+# State Persistence (Optional - keeps alert cooldowns across restarts, put it on a persistent volume)
+# STATE_DB=/app/data/checker_state.db
+STATE_FLUSH_INTERVAL=5      # Write changed check states at most every N seconds
+HISTORY_SIZE=60             # Results with connect/query latency kept in memory per check
+HISTORY_SPILL=false         # Also append every result to STATE_DB
+HISTORY_RETENTION_DAYS=7    # Delete spilled results older than this
+
+# Check Catalog (Optional - for large fleets, loaded in addition to DB_CHECK_N_* variables)
+# CHECKS_FILE=/app/checks.jsonl  # .json, .jsonl/.ndjson, .toml or .yaml with one entry per check, e.g.
+# {"name": "Orders", "type": "postgres", "host": "db", "database": "app", "user_env": "PG_USER", "password_env": "PG_PASS", "table_name": "orders"}
+# CHECKS_FILE_POLL=0            # Reload the catalog this many seconds after it changes (0 = off); SIGHUP reloads it too
+
+# Database Check 1 - SQLite Example
+DB_CHECK_1_NAME=User Sessions Table
+DB_CHECK_1_TYPE=sqlite
+DB_CHECK_1_DB_PATH=/app/data/sessions.db
+DB_CHECK_1_TABLE_NAME=user_sessions
+DB_CHECK_1_ALERT_EMAIL_ENV=ALERT_EMAIL_ADMIN    # References ALERT_EMAIL_ADMIN env var
+
+# Database Check 2 - PostgreSQL Example
+DB_CHECK_2_NAME=Orders Table
+DB_CHECK_2_TYPE=postgres
+DB_CHECK_2_HOST=localhost
+DB_CHECK_2_PORT=5432
+DB_CHECK_2_DATABASE=myapp
+DB_CHECK_2_USER_ENV=POSTGRES_USER      # Name of env var containing username
+# DB_CHECK_2_PASSWORD_ENV=POSTGRES_PASS  # Name of env var containing password
+DB_CHECK_2_TABLE_NAME=orders
+DB_CHECK_2_ALERT_EMAIL_ENV=ALERT_EMAIL_DEV      # References ALERT_EMAIL_DEV env var
+DB_CHECK_2_TIMEOUT=5                            # Optional, overrides CHECK_TIMEOUT
+DB_CHECK_2_INTERVAL=15                          # Optional, overrides CHECK_INTERVAL
+
+# Database Check 3 - MySQL Example
+DB_CHECK_3_NAME=Invoices Table
+DB_CHECK_3_TYPE=mysql
+DB_CHECK_3_HOST=db.example.com
+DB_CHECK_3_PORT=3306
+DB_CHECK_3_DATABASE=billing
+DB_CHECK_3_USER_ENV=MYSQL_USER
+# DB_CHECK_3_PASSWORD_ENV=MYSQL_PASS
+DB_CHECK_3_TABLE_NAME=invoices
+DB_CHECK_3_SSL_CA=./ca-certificate.crt          # Optional, SSL is used without certificate verification
+# DB_CHECK_3_SSL_DISABLED=true                  # Optional, disable SSL entirely
+
+# Alert email addresses
+ALERT_EMAIL_ADMIN=admin@example.com    # For critical system alerts
+ALERT_EMAIL_DEV=dev@example.com        # For development alerts
+
+# Database credentials
+POSTGRES_USER=myuser
+# POSTGRES_PASS=your_secure_password_here
+MYSQL_USER=myuser
+# MYSQL_PASS=your_secure_password_here
+
+# You can add more checks with further numbers (gaps in the numbering are fine):
+# DB_CHECK_4_NAME=...
+# DB_CHECK_4_TYPE=...
+# etc.
+"""
+        print(template)
+    
+    def should_send_alert(self, check_id: int) -> bool:
+        """
+        Check if enough time has passed since last alert to avoid spam.
+        
+        Args:
+            check_id: ID of the check
+            
+        Returns:
+            True if alert should be sent, False otherwise
+        """
+        return not self.check_state.in_cooldown(check_id, self.alert_cooldown)
+    
+    def check_table_sqlite(self, db_path: str, table_name: str) -> bool:
+        """
+        Check if table exists in SQLite database.
+        
+        Args:
+            db_path: Path to SQLite database file
+            table_name: Name of table to check
+            
+        Returns:
+            True if table exists, False otherwise
+        """
+        try:
+            return self.backends['sqlite'].probe({'db_path': db_path}, [table_name], None)[table_name]
+            
+        except Exception as e:
+            logger.error(f"SQLite error for {db_path}: {e}")
+            return False
+    
+    def check_table_postgres(self, host: str, database: str, user: str, 
+                           password: str, table_name: str, port: int = 5432) -> bool:
+        """
+        Check if table exists in PostgreSQL database.
+        
+        Args:
+            host: Database host
+            database: Database name
+            user: Username
+            password: Password
+            table_name: Name of table to check
+            port: Database port (default 5432)
+            
+        Returns:
+            True if table exists, False otherwise
+        """
+        settings = {'host': host, 'port': port, 'database': database, 'user': user, 'password': password}
+        try:
+            return self.backends['postgres'].probe(settings, [table_name], None)[table_name]
+            
+        except Exception as e:
+            logger.error(f"PostgreSQL error for {host}:{port}/{database}: {e}")
+            return False
+    
+    def check_table_mysql(self, host: str, database: str, user: str,
+                          password: str, table_name: str, port: int = 3306) -> bool:
+        """
+        Check if table exists in MySQL database.
+        
+        Args:
+            host: Database host
+            database: Database name
+            user: Username
+            password: Password
+            table_name: Name of table to check
+            port: Database port (default 3306)
+            
+        Returns:
+            True if table exists, False otherwise
+        """
+        settings = {'host': host, 'port': port, 'database': database, 'user': user, 'password': password,
+                    'ssl_ca': '', 'ssl_disabled': 'false'}
+        try:
+            return self.backends['mysql'].probe(settings, [table_name], None)[table_name]
+            
+        except Exception as e:
+            logger.error(f"MySQL error for {host}:{port}/{database}: {e}")
+            return False
+    
+    async def check_table_sqlite_async(self, db_path: str, table_name: str) -> bool:
+        """
+        Check if table exists in SQLite database without blocking the event loop.
+        
+        Args:
+            db_path: Path to SQLite database file
+            table_name: Name of table to check
+            
+        Returns:
+            True if table exists, False otherwise
+        """
+        try:
+            return (await self.backends['sqlite'].probe_async({'db_path': db_path}, [table_name], None))[table_name]
+            
+        except Exception as e:
+            logger.error(f"SQLite error for {db_path}: {e}")
+            return False
+    
+    async def check_table_postgres_async(self, host: str, database: str, user: str,
+                                         password: str, table_name: str, port: int = 5432) -> bool:
+        """
+        Check if table exists in PostgreSQL database using non-blocking I/O.
         
-        # Load monitoring settings from environment
-        self.check_interval = int(os.getenv('CHECK_INTERVAL', '300'))  # Default: 5 minutes
-        self.alert_cooldown = int(os.getenv('ALERT_COOLDOWN', '3600'))  # Default: 1 hour
+        Args:
+            host: Database host
+            database: Database name
+            user: Username
+            password: Password
+            table_name: Name of table to check
+            port: Database port (default 5432)
+            
+        Returns:
+            True if table exists, False otherwise
+        """
+        settings = {'host': host, 'port': port, 'database': database, 'user': user, 'password': password}
+        try:
+            return (await self.backends['postgres'].probe_async(settings, [table_name], None))[table_name]
+            
+        except Exception as e:
+            logger.error(f"PostgreSQL error for {host}:{port}/{database}: {e}")
+            return False
+    
+    def send_email_alert(self, to_email: str, table_name: str, database_info: str, 
+                      check_name: str = None, status: str = 'missing',
+                      check_id: Optional[int] = None) -> bool:
+        """
+        Send email alert when table is not found or could not be checked in time.
         
-        # Initialize monitoring state
-        self.is_running = False
-        self.check_thread = None
-        self.checks_config = []
-        self.last_alert_times = {}  # Track when we last sent alerts to avoid spam
+        The message is queued for the background AlertSender, so the check
+        path never waits on SMTP.
         
-        # Load default alert email address
-        self.default_alert_email = os.getenv('DEFAULT_ALERT_EMAIL')
+        Args:
+            to_email: Recipient email address
+            table_name: Name of missing table
+            database_info: Database information for context
+            check_name: Name of the check
+            status: 'missing' or 'timeout'
+            check_id: ID of the check (for cooldown tracking)
+            
+        Returns:
+            True if email was queued, False otherwise
+        """
+        # Check cooldown if check_id provided
+        if check_id is not None and not self.should_send_alert(check_id):
+            logger.info(f"Skipping alert for '{check_name}' - still in cooldown period")
+            self.metrics.alerts_suppressed += 1
+            return False
         
-        # Load database checks from environment
-        self._load_checks_from_env()
+        self.metrics.alerts_raised += 1
+        alert = (check_id, check_name, table_name, database_info, status)
+        if self.alert_digest != 'off':
+            self._add_to_digest(to_email, alert)
+            return True
         
-        logger.info(f"Initialized checker with {len(self.checks_config)} checks")
+        subject, message_body = self._format_alert([alert])
+        return self._queue_alert(to_email, subject, message_body, [] if check_id is None else [check_id])
     
-    def _get_required_env(self, var_name: str) -> str:
+    def _format_alert(self, alerts: List[tuple]) -> tuple:
         """
-        Get a required environment variable or raise an error.
+        Format the subject and body of an alert email.
         
         Args:
-            var_name: Name of the environment variable
+            alerts: List of (check_id, check_name, table_name, database_info, status) for failed checks
             
         Returns:
-            The environment variable value
-            
-        Raises:
-            ValueError: If the environment variable is not set
+            Tuple of (subject, message_body)
         """
-        value = os.getenv(var_name)
-        if not value:
-            raise ValueError(f"Required environment variable {var_name} is not set")
-        return value
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        if len(alerts) == 1:
+            _, _, table_name, database_info, status = alerts[0]
+            if status == 'timeout':
+                subject = f"⚠️ DATABASE ALERT: Check for table '{table_name}' timed out"
+                message_body = f"⚠️ ALERT [{timestamp}]:\n\nCould not check table '{table_name}': database {database_info} did not answer in time.\n\nPlease check the database is reachable."
+            else:
+                subject = f"⚠️ DATABASE ALERT: Table '{table_name}' not found"
+                message_body = f"⚠️ ALERT [{timestamp}]:\n\nTable '{table_name}' not found in database {database_info}.\n\nPlease check immediately."
+            return subject, message_body
+        
+        subject = f"⚠️ DATABASE ALERT: {len(alerts)} tables not found or not checked"
+        lines = [f"  - Table '{table_name}' in database {database_info}" +
+                 (" (check timed out)" if status == 'timeout' else "") +
+                 (f" (check '{check_name}')" if check_name else "")
+                 for _, check_name, table_name, database_info, status in alerts]
+        message_body = (f"⚠️ ALERT [{timestamp}]:\n\nThe following {len(alerts)} tables were not found or could not be checked:\n\n" +
+                        "\n".join(lines) + "\n\nPlease check immediately.")
+        return subject, message_body
     
-    def _load_checks_from_env(self) -> None:
+    def _queue_alert(self, to_email: str, subject: str, message_body: str, check_ids: List[int]) -> bool:
         """
-        Load database checks from environment variables.
+        Build an alert email and hand it to the background sender.
         
-        Environment variables should follow the pattern:
-        DB_CHECK_1_NAME=User Sessions Table
-        DB_CHECK_1_TYPE=sqlite
-        DB_CHECK_1_DB_PATH=/app/data/sessions.db
-        DB_CHECK_1_TABLE_NAME=user_sessions
-        DB_CHECK_1_ALERT_EMAIL_ENV=ALERT_EMAIL_ADMIN
+        Args:
+            to_email: Recipient email address
+            subject: Email subject
+            message_body: Plain text email body
+            check_ids: Checks covered by the email (for cooldown tracking)
+            
+        Returns:
+            True if email was queued, False otherwise
+        """
+        # Create the email message
+        msg = MIMEMultipart()
+        msg['From'] = self.gmail_sender
+        msg['To'] = to_email
+        msg['Subject'] = subject
         
-        For PostgreSQL:
-        DB_CHECK_2_NAME=Orders Table
-        DB_CHECK_2_TYPE=postgres
-        DB_CHECK_2_HOST=localhost
-        DB_CHECK_2_PORT=5432
-        DB_CHECK_2_DATABASE=myapp
-        DB_CHECK_2_USER_ENV=DB_USER
-        DB_CHECK_2_PASSWORD_ENV=DB_PASSWORD
-        DB_CHECK_2_TABLE_NAME=orders
-        DB_CHECK_2_ALERT_EMAIL_ENV=ALERT_EMAIL_DEV
+        # Attach the message body
+        msg.attach(MIMEText(message_body, 'plain'))
         
-        If ALERT_EMAIL_ENV is not specified, uses DEFAULT_ALERT_EMAIL
+        def on_delivery(ok: bool) -> None:
+            # Allow the next cycle to retry if delivery failed
+            if not ok:
+                for check_id in check_ids:
+                    self.check_state.clear_alert(check_id)
+        
+        # Hand the message to the background sender, this never blocks on SMTP
+        if not self.alert_sender.enqueue(msg, on_delivery):
+            return False
+        
+        # Update last alert time when queued, so the next cycle does not queue a duplicate
+        for check_id in check_ids:
+            self.check_state.record_alert(check_id)
+        
+        logger.info(f"Email alert to {to_email} queued")
+        return True
+    
+    def _add_to_digest(self, to_email: str, alert: tuple) -> None:
         """
-        check_num = 1
+        Collect a missing table for the next digest email to its recipient.
         
-        while True:
-            prefix = f"DB_CHECK_{check_num}_"
-            name = os.getenv(f"{prefix}NAME")
+        Args:
+            to_email: Recipient email address
+            alert: (check_id, check_name, table_name, database_info, status) of the failed check
+        """
+        check_id, _, table_name, _, _ = alert
+        with self.digest_lock:
+            self.pending_alerts.setdefault(to_email, []).append(alert)
+            # Hold the check in cooldown while it waits in the digest
+            if check_id is not None:
+                self.check_state.record_alert(check_id)
             
-            if not name:
-                break  # No more checks to load
+            if self.alert_digest != 'cycle' and self.digest_timer is None:
+                self.digest_timer = threading.Timer(float(self.alert_digest), self.flush_alert_digests)
+                self.digest_timer.daemon = True
+                self.digest_timer.start()
+        
+        logger.info(f"Alert for table '{table_name}' added to digest for {to_email}")
+    
+    def flush_alert_digests(self) -> None:
+        """
+        Send one email per recipient listing every missing table collected so far.
+        """
+        with self.digest_lock:
+            pending = self.pending_alerts
+            self.pending_alerts = {}
+            self.digest_timer = None
+        
+        for to_email, alerts in pending.items():
+            check_ids = [alert[0] for alert in alerts if alert[0] is not None]
             
-            check_type = os.getenv(f"{prefix}TYPE")
-            table_name = os.getenv(f"{prefix}TABLE_NAME")
+            subject, message_body = self._format_alert(alerts)
+            if not self._queue_alert(to_email, subject, message_body, check_ids):
+                for check_id in check_ids:
+                    self.check_state.clear_alert(check_id)
+    
+    def _describe_database(self, check_config: CheckConfig) -> str:
+        """
+        Describe the database of a check for logs and alert emails.
+        
+        Args:
+            check_config: Check configuration
             
-            # Get alert email from environment variable
-            alert_email_env = os.getenv(f"{prefix}ALERT_EMAIL_ENV")
-            if alert_email_env:
-                alert_email = os.getenv(alert_email_env)
-                if not alert_email:
-                    logger.error(f"Alert email environment variable '{alert_email_env}' not set for check {check_num}")
-                    check_num += 1
-                    continue
-            else:
-                # Fall back to default alert email
-                alert_email = self.default_alert_email
-                if not alert_email:
-                    logger.error(f"No alert email configured for check {check_num} and no DEFAULT_ALERT_EMAIL set")
-                    check_num += 1
-                    continue
+        Returns:
+            Human readable database description
+        """
+        return check_config.driver.describe(check_config.settings)
+    
+    def _report_check_result(self, check_config: CheckConfig, status: str) -> None:
+        """
+        Log the result of a check and send an alert if the table is missing.
+        
+        Args:
+            check_config: Check configuration
+            status: 'ok', 'missing', 'timeout' or 'circuit_open'
+        """
+        check_name = check_config.name
+        table_name = check_config.table_name
+        
+        if status == 'ok':
+            logger.info(f"✅ [{check_name}] Table '{table_name}' exists")
+            return
+        
+        if status == 'circuit_open':
+            # The endpoint already failed and alerted, wait for the next probe
+            logger.info(f"⏸️ [{check_name}] Check for table '{table_name}' skipped, database circuit is open")
+            return
+        
+        if status == 'timeout':
+            logger.warning(f"⏱️ [{check_name}] Check for table '{table_name}' TIMED OUT "
+                           f"after {check_config.timeout}s")
+        else:
+            logger.warning(f"❌ [{check_name}] Table '{table_name}' NOT FOUND")
+        self.send_email_alert(check_config.alert_email, table_name,
+                              self._describe_database(check_config), check_name, status,
+                              check_config.check_id)
+    
+    def _endpoint_key(self, check_config: CheckConfig) -> tuple:
+        """
+        Get the key identifying the database a check connects to.
+        
+        Args:
+            check_config: Check configuration
             
-            if not all([check_type, table_name, alert_email]):
-                logger.error(f"Incomplete configuration for DB_CHECK_{check_num}")
-                check_num += 1
-                continue
+        Returns:
+            Tuple identifying the database endpoint
+        """
+        return check_config.driver.endpoint_key(check_config.settings)
+    
+    def _group_checks(self, checks: List[CheckConfig]) -> Dict[tuple, List[CheckConfig]]:
+        """
+        Group checks by the database they connect to.
+        
+        Args:
+            checks: Check configurations to group
             
-            check_config = {
-                "name": name,
-                "type": check_type,
-                "table_name": table_name,
-                "alert_email": alert_email
-            }
-            
-            if check_type == 'sqlite':
-                db_path = os.getenv(f"{prefix}DB_PATH")
-                if not db_path:
-                    logger.error(f"Missing DB_PATH for SQLite check {check_num}")
-                    check_num += 1
-                    continue
-                check_config["db_path"] = db_path
-                
-            elif check_type == 'postgres':
-                host = os.getenv(f"{prefix}HOST")
-                database = os.getenv(f"{prefix}DATABASE")
-                port = int(os.getenv(f"{prefix}PORT", "5432"))
-                
-                # Get user and password from their own environment variables
-                user_env = os.getenv(f"{prefix}USER_ENV", f"DB_CHECK_{check_num}_USER")
-                password_env = os.getenv(f"{prefix}PASSWORD_ENV", f"DB_CHECK_{check_num}_PASSWORD")
-                
-                user = os.getenv(user_env)
-                password = os.getenv(password_env)
-                
-                if not all([host, database, user, password]):
-                    logger.error(f"Missing PostgreSQL credentials for check {check_num}")
-                    logger.error(f"Required: {prefix}HOST, {prefix}DATABASE, {user_env}, {password_env}")
-                    check_num += 1
-                    continue
-                
-                check_config.update({
-                    "host": host,
-                    "port": port,
-                    "database": database,
-                    "user": user,
-                    "password": password
-                })
+        Returns:
+            Dictionary mapping endpoint keys to the checks against that endpoint
+        """
+        groups = {}
+        for check_config in checks:
+            groups.setdefault(self._endpoint_key(check_config), []).append(check_config)
+        return groups
+    
+    def _check_identity(self, check_config: CheckConfig) -> tuple:
+        """
+        Get the key that matches a reloaded check to the running one.
+        
+        Args:
+            check_config: Check configuration
+            
+        Returns:
+            Tuple of name, type, table and database endpoint
+        """
+        return (check_config.name, check_config.type, check_config.table_name,
+                self._endpoint_key(check_config))
+    
+    def _apply_checks(self, checks: List[CheckConfig]) -> Dict[str, int]:
+        """
+        Make a freshly loaded set of checks the active one.
+        
+        Each check is matched to an active check with the same name, type,
+        table and database and takes over its check ID, so its last result,
+        alert cooldown and schedule carry over. Unmatched checks get the
+        lowest released ID, or a new one, so the per-check arrays stay as
+        large as the most checks loaded at once however often the catalog
+        is reloaded. The state, history and metrics of removed checks are
+        cleared before their IDs are reused. The new set is swapped in with
+        single assignments, so the monitoring loop keeps running throughout.
+        Databases that are no longer checked release their pooled connections,
+        cached schema and circuit breaker.
+        
+        Args:
+            checks: Loaded checks, their check IDs are assigned here
             
+        Returns:
+            Dictionary with added, removed, changed and unchanged check counts
+        """
+        active = {}
+        for check_config in self.checks_config:
+            active.setdefault(self._check_identity(check_config), []).append(check_config)
+        
+        applied, added, changed = [], [], []
+        unmatched = []  # Indexes into applied of checks that need an ID
+        unchanged = 0
+        for check_config in checks:
+            matches = active.get(self._check_identity(check_config))
+            if not matches:
+                unmatched.append(len(applied))
             else:
-                logger.error(f"Unsupported database type '{check_type}' for check {check_num}")
-                check_num += 1
-                continue
+                previous = matches.pop(0)
+                check_config = check_config._replace(check_id=previous.check_id)
+                if check_config != previous:
+                    changed.append((previous, check_config))
+                else:
+                    check_config = previous
+                    unchanged += 1
+            applied.append(check_config)
+        removed = [check_config for matches in active.values() for check_config in matches]
+        
+        for check_config in removed:
+            self.state_keys.pop(check_config.check_id, None)
+            self.check_state.clear(check_config.check_id)
+            self.check_history.clear(check_config.check_id)
+            self.metrics.remove_check(check_config.check_id)
+            heapq.heappush(self.free_check_ids, check_config.check_id)
+        for index in unmatched:
+            applied[index] = applied[index]._replace(check_id=self._allocate_check_id())
+            added.append(applied[index])
+        
+        self.check_state.resize(self.next_check_id)
+        self.check_history.resize(self.next_check_id)
+        self.metrics.resize(self.next_check_id)
+        for check_config in added:
+            database_info = self._describe_database(check_config)
+            self.metrics.add_check(
+                check_config.check_id,
+                {'check': check_config.name, 'backend': check_config.type,
+                 'endpoint': database_info, 'table': check_config.table_name},
+                self._endpoint_key(check_config),
+                {'backend': check_config.type, 'endpoint': database_info}
+            )
+        if added and self.state_store:
+            self._restore_state(added)
+        old_groups = self.check_groups
+        self.checks_by_id = {check_config.check_id: check_config for check_config in applied}
+        self.check_groups = self._group_checks(applied)
+        self.checks_config = applied
+        
+        if self.is_running:
+            for check_config in removed:
+                self.scheduler.remove(check_config.check_id)
+            for check_config in added:
+                self._schedule(check_config)
+            for previous, check_config in changed:
+                if check_config.interval != previous.interval:
+                    self._schedule(check_config)
+            self._wake()
+        
+        for key in old_groups.keys() - self.check_groups.keys():
+            first = old_groups[key][0]
+            first.driver.release(first.settings)
+            self.breakers.pop(key, None)
+        
+        if self.is_running and (added or removed):
+            self._update_watchers(old_groups)
+        
+        return {'added': len(added), 'removed': len(removed), 'changed': len(changed), 'unchanged': unchanged}
+    
+    def _allocate_check_id(self) -> int:
+        """
+        Get an ID for a new check, reusing the lowest released one.
+        
+        Returns:
+            Check ID
+        """
+        if self.free_check_ids:
+            return heapq.heappop(self.free_check_ids)
+        self.next_check_id += 1
+        return self.next_check_id - 1
+    
+    def _update_watchers(self, old_groups: Dict[tuple, List[CheckConfig]]) -> None:
+        """
+        Bring the SQLite file watcher and PostgreSQL listener in line with reloaded checks.
+        
+        Args:
+            old_groups: Check groups before the reload
+        """
+        if self.sqlite_watch == 'inotify':
+            sqlite_ids = lambda groups: {check_config.check_id for key, checks in groups.items()
+                                         if key[0] == 'sqlite' for check_config in checks}
+            if sqlite_ids(old_groups) != sqlite_ids(self.check_groups):
+                if self.sqlite_watcher:
+                    self.sqlite_watcher.stop()
+                    self.sqlite_watcher = None
+                self._start_sqlite_watcher()
+        
+        if self.postgres_watch != 'off':
+            if self.postgres_listener is None:
+                self._start_postgres_listener()
+                return
+            old_keys = {key for key in old_groups if key[0] == 'postgres'}
+            new_keys = {key for key in self.check_groups if key[0] == 'postgres'}
+            for key in old_keys - new_keys:
+                self.postgres_listener.remove(key)
+            for key in new_keys - old_keys:
+                self._listen_postgres(self.postgres_listener, key)
+    
+    def _restore_state(self, checks: List[CheckConfig]) -> None:
+        """
+        Load the stored state of checks from the state database.
+        
+        Args:
+            checks: Checks to restore, matched to stored rows by name, type, table and database
+        """
+        try:
+            rows = self.state_store.load()
+        except sqlite3.Error as e:
+            logger.error(f"Cannot read state database {self.state_db}: {e}")
+            return
+        
+        restored = 0
+        for check_config in checks:
+            key = json.dumps(self._check_identity(check_config))
+            self.state_keys[check_config.check_id] = key
+            row = rows.get(key)
+            if row is not None:
+                self.check_state.restore(check_config.check_id, *row)
+                restored += 1
+        logger.info(f"Restored the state of {restored} of {len(checks)} checks from {self.state_db}")
+    
+    def _persist_state(self, force: bool = False) -> None:
+        """
+        Write the state of checks that changed since the last write to the state database.
+        
+        Writes are batched into one transaction per STATE_FLUSH_INTERVAL, so
+        a cycle normally costs nothing but collecting changed check IDs.
+        Changes made within the interval are written by a timer once it has
+        passed, so they do not wait for the next cycle. If the write fails,
+        the checks stay marked as changed and the spilled results are kept
+        for the next attempt.
+        
+        Args:
+            force: Write now even if the flush interval has not passed
+        """
+        with self.state_flush_lock:
+            if self.state_store is None:
+                return  # Not configured, or closed by stop_monitoring before a pending timer fired
+            now = time.monotonic()
+            wait = self.state_flush_interval - (now - self.state_flushed_at)
+            if not force and wait > 0:
+                if self.state_flush_timer is None:
+                    self.state_flush_timer = threading.Timer(wait, self._persist_state, kwargs={'force': True})
+                    self.state_flush_timer.daemon = True
+                    self.state_flush_timer.start()
+                return
+            if self.state_flush_timer is not None:
+                self.state_flush_timer.cancel()
+                self.state_flush_timer = None
+            self.state_flushed_at = now
+            
+            rows, written = [], []
+            for check_id in self.check_state.take_dirty():
+                key = self.state_keys.get(check_id)
+                if key is not None:  # Removed by a reload
+                    row = self.check_state.row(check_id)
+                    rows.append((key, row['last_run'], row['last_result'], row['last_alert'], row['failures']))
+                    written.append(check_id)
+            history = self.unsaved_history + [
+                (self.state_keys[check_id], at, status, connect_ms, query_ms)
+                for check_id, at, status, connect_ms, query_ms in self.check_history.take_spilled()
+                if check_id in self.state_keys]
+            self.unsaved_history = []
+            try:
+                self.state_store.save(rows, history)
+            except sqlite3.Error as e:
+                logger.error(f"Cannot write {len(rows)} check states to {self.state_db}, retrying later: {e}")
+                self.check_state.mark_dirty(written)
+                # Keep at most as many results as the in-memory history holds, dropping the oldest
+                limit = len(self.check_history.count) * self.check_history.depth
+                self.unsaved_history = history[-limit:] if limit else []
+                return
             
-            self.checks_config.append(check_config)
-            logger.info(f"Loaded check {check_num}: {name} ({check_type})")
-            check_num += 1
+            if self.check_history.spill and now - self.history_pruned_at > 3600:
+                self.history_pruned_at = now
+                try:
+                    self.state_store.prune_history(time.time() - self.history_retention)
+                except sqlite3.Error as e:
+                    logger.error(f"Cannot prune check history in {self.state_db}: {e}")
     
-    def print_env_template(self) -> None:
+    def _publish_status(self, force: bool = False) -> None:
         """
-        Print a template of required environment variables.
+        Mark the status snapshot stale so it is rendered again off the calling thread.
+        
+        Building the status and the dashboard takes time in proportion to
+        the number of checks, so the monitoring loop only schedules it: a
+        timer thread renders the snapshot at most once per
+        STATUS_SNAPSHOT_INTERVAL, and changes made while it is pending are
+        picked up by the same render.
+        
+        Args:
+            force: Render now on the calling thread, e.g. before the server starts serving
         """
-        template = """
-# Database Table Checker Environment Variables Template
-# Copy this to your .env file and fill in the values
-
-# Gmail Configuration (Required)
-GMAIL_USER=your.email@gmail.com
-# GMAIL_APP_PASSWORD=your_gmail_app_password  # Generate this in your Google Account settings
-
-# Default Alert Email (Optional - used when no specific alert email is set)
-DEFAULT_ALERT_EMAIL=alerts@example.com
-
-# Monitoring Settings (Optional)
-CHECK_INTERVAL=300          # Check interval in seconds (default: 300 = 5 minutes)
-ALERT_COOLDOWN=3600         # Alert cooldown in seconds (default: 3600 = 1 hour)
-
-# Database Check 1 - SQLite Example
-DB_CHECK_1_NAME=User Sessions Table
-DB_CHECK_1_TYPE=sqlite
-DB_CHECK_1_DB_PATH=/app/data/sessions.db
-DB_CHECK_1_TABLE_NAME=user_sessions
-DB_CHECK_1_ALERT_EMAIL_ENV=ALERT_EMAIL_ADMIN    # References ALERT_EMAIL_ADMIN env var
-
-# Database Check 2 - PostgreSQL Example
-DB_CHECK_2_NAME=Orders Table
-DB_CHECK_2_TYPE=postgres
-DB_CHECK_2_HOST=localhost
-DB_CHECK_2_PORT=5432
-DB_CHECK_2_DATABASE=myapp
-DB_CHECK_2_USER_ENV=POSTGRES_USER      # Name of env var containing username
-# DB_CHECK_2_PASSWORD_ENV=POSTGRES_PASS  # Name of env var containing password
-DB_CHECK_2_TABLE_NAME=orders
-DB_CHECK_2_ALERT_EMAIL_ENV=ALERT_EMAIL_DEV      # References ALERT_EMAIL_DEV env var
-
-# Alert email addresses
-ALERT_EMAIL_ADMIN=admin@example.com    # For critical system alerts
-ALERT_EMAIL_DEV=dev@example.com        # For development alerts
-
-# Database credentials
-POSTGRES_USER=myuser
-# POSTGRES_PASS=your_secure_password_here
-
-# You can add more checks by incrementing the number:
-# DB_CHECK_3_NAME=...
-# DB_CHECK_3_TYPE=...
-# etc.
-"""
-        print(template)
+        if not self.status_port:
+            return
+        if force:
+            self._render_status()
+            return
+        with self.status_publish_lock:
+            if self.status_publish_timer is not None:
+                return  # The pending render includes this change
+            wait = max(0.0, self.status_snapshot_interval - (time.monotonic() - self.status_published_at))
+            self.status_publish_timer = threading.Timer(wait, self._render_status)
+            self.status_publish_timer.daemon = True
+            self.status_publish_timer.start()
+    
+    def _render_status(self) -> None:
+        """
+        Render a fresh status snapshot for the HTTP server and swap it in.
+        
+        The snapshot is replaced with a single assignment, so requests keep
+        reading the previous one until the new one is complete.
+        """
+        with self.status_publish_lock:
+            if self.status_publish_timer is not None:
+                self.status_publish_timer.cancel()  # Harmless when called by that timer
+                self.status_publish_timer = None
+            self.status_published_at = time.monotonic()
+        with self.status_render_lock:
+            try:
+                self.status_snapshot = build_snapshot(self.get_status())
+            except Exception as e:
+                logger.error(f"Error rendering status snapshot: {e}")
+    
+    def get_check_detail(self, check_id: int) -> Optional[Dict]:
+        """
+        Get the configuration, state and result history of one check.
+        
+        Args:
+            check_id: Check ID
+            
+        Returns:
+            Dictionary with check details, or None if no such check is configured
+        """
+        check = self.checks_by_id.get(check_id)
+        if check is None:
+            return None
+        return {
+            'id': check.check_id,
+            'name': check.name,
+            'type': check.type,
+            'table': check.table_name,
+            'database': self._describe_database(check),
+            'interval': check.interval,
+            'timeout': check.timeout,
+            **self.check_state.snapshot(check_id),
+            'latency': self.check_history.latency(check_id),
+            'history': self.check_history.samples(check_id)
+        }
+    
+    def render_metrics(self) -> bytes:
+        """
+        Render all metrics in the Prometheus text exposition format.
+        
+        Per-check and per-database series come from the preallocated
+        CheckMetrics arrays; pool, alert queue and circuit breaker gauges are
+        read from their owners at scrape time.
+        
+        Returns:
+            Exposition text as UTF-8 bytes
+        """
+        pools = [(name, pool.stats()) for driver in self.backends.values()
+                 for name, pool in driver.pools().items()]
+        sender = self.alert_sender.stats()
+        breakers = [breaker.snapshot()['state'] for breaker in list(self.breakers.values())]
+        extra = [
+            ('db_checker_checks', 'gauge', 'Configured checks', [('', len(self.checks_config))]),
+            ('db_checker_pool_idle_connections', 'gauge', 'Idle pooled connections',
+             [(f'pool="{name}"', stats['idle']) for name, stats in pools]),
+            ('db_checker_pool_connections_created_total', 'counter', 'Connections opened for the pool',
+             [(f'pool="{name}"', stats['created']) for name, stats in pools]),
+            ('db_checker_pool_connections_reused_total', 'counter', 'Pooled connections reused',
+             [(f'pool="{name}"', stats['reused']) for name, stats in pools]),
+            ('db_checker_alert_queue_length', 'gauge', 'Alert emails waiting to be sent', [('', sender['queued'])]),
+            ('db_checker_emails_sent_total', 'counter', 'Alert emails delivered', [('', sender['sent'])]),
+            ('db_checker_emails_dropped_total', 'counter', 'Alert emails dropped because the queue was full',
+             [('', sender['dropped'])]),
+            ('db_checker_circuits_open', 'gauge', 'Databases whose circuit breaker is open',
+             [('', sum(state == 'open' for state in breakers))])
+        ]
+        return self.metrics.render(extra).encode('utf-8')
     
-    def should_send_alert(self, check_name: str) -> bool:
+    def start_status_server(self) -> None:
         """
-        Check if enough time has passed since last alert to avoid spam.
+        Start the HTTP status server if PORT is set and it is not running yet.
+        """
+        if not self.status_port or self.status_server is not None:
+            return
+        self._publish_status(force=True)
+        server = StatusServer(lambda: self.status_snapshot, self.get_check_detail,
+                              host=self.status_host, port=self.status_port,
+                              metrics=self.render_metrics, events=self.events, token=self.status_token)
+        try:
+            server.start()
+        except OSError as e:
+            logger.error(f"Cannot serve status on port {self.status_port}: {e}")
+            return
+        self.status_server = server
+    
+    def _checks_file_mtime(self) -> Optional[int]:
+        """
+        Get the modification time of CHECKS_FILE in nanoseconds, None if it cannot be read.
+        """
+        try:
+            return os.stat(self.checks_file).st_mtime_ns
+        except OSError:
+            return None
+    
+    def reload_checks(self) -> bool:
+        """
+        Reload the check configuration without stopping monitoring.
+        
+        Re-reads the DB_CHECK_N_* variables and CHECKS_FILE and applies the
+        difference to the running checker. If the catalog cannot be read the
+        current checks stay active.
+        
+        Returns:
+            bool: True if the reloaded checks were applied
+        """
+        with self.reload_lock:
+            started = time.perf_counter()
+            checks = self._load_checks_from_env()
+            if self.checks_file:
+                self.checks_file_mtime = self._checks_file_mtime()
+                try:
+                    checks += self._load_checks_from_file(self.checks_file)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Could not reload check catalog {self.checks_file}, keeping the current checks: {e}")
+                    return False
+            
+            counts = self._apply_checks(checks)
+            self._publish_status(force=True)
+            logger.info(f"Reloaded {len(self.checks_config)} checks in {time.perf_counter() - started:.2f}s: "
+                        f"{counts['added']} added, {counts['removed']} removed, "
+                        f"{counts['changed']} changed, {counts['unchanged']} unchanged")
+            if not self.checks_config:
+                logger.warning("No checks configured after reload, nothing is monitored")
+            return True
+    
+    def _watch_checks_file(self) -> None:
+        """
+        Reload the checks whenever the modification time of CHECKS_FILE changes.
+        """
+        while not self.config_watch_stop.wait(self.checks_file_poll):
+            mtime = self._checks_file_mtime()
+            if mtime is None or mtime == self.checks_file_mtime:
+                continue
+            logger.info(f"{self.checks_file} changed, reloading checks")
+            try:
+                self.reload_checks()
+            except Exception as e:
+                logger.error(f"Error reloading checks: {e}")
+    
+    def _group_timeout(self, checks: List[CheckConfig]) -> float:
+        """
+        Get the deadline in seconds for one batched lookup.
+        
+        Checks against the same database share a lookup, so the tightest
+        timeout of the group applies.
         
         Args:
-            check_name: Name of the check
+            checks: Checks sharing the same endpoint
             
         Returns:
-            True if alert should be sent, False otherwise
+            Timeout in seconds
         """
-        now = datetime.now()
-        last_alert = self.last_alert_times.get(check_name)
+        return min(check_config.timeout for check_config in checks)
+    
+    def _breaker(self, checks: List[CheckConfig]) -> CircuitBreaker:
+        """
+        Get the circuit breaker guarding the endpoint of a check group.
         
-        if not last_alert:
-            return True
+        Args:
+            checks: Checks sharing the same endpoint
             
-        return (now - last_alert).total_seconds() > self.alert_cooldown
+        Returns:
+            The endpoint's CircuitBreaker
+        """
+        key = self._endpoint_key(checks[0])
+        breaker = self.breakers.get(key)
+        if breaker is None:
+            breaker = self.breakers.setdefault(key, CircuitBreaker(
+                self.breaker_threshold, self.breaker_backoff, self.breaker_max_backoff))
+        return breaker
     
-    def check_table_sqlite(self, db_path: str, table_name: str) -> bool:
+    def _is_active(self, check_config: CheckConfig) -> bool:
         """
-        Check if table exists in SQLite database.
+        Tell whether a check is still loaded under its check ID.
         
         Args:
-            db_path: Path to SQLite database file
-            table_name: Name of table to check
+            check_config: Check configuration the run started with
             
         Returns:
-            True if table exists, False otherwise
+            True unless a reload removed the check, possibly giving its ID to another one
         """
-        try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name=?
-            """, (table_name,))
-            
-            result = cursor.fetchone()
-            conn.close()
-            
-            return result is not None
+        current = self.checks_by_id.get(check_config.check_id)
+        if current is check_config:
+            return True
+        return current is not None and self._check_identity(current) == self._check_identity(check_config)
+    
+    def _report_group_outcome(self, checks: List[CheckConfig], found: Optional[Dict[str, bool]] = None,
+                              error: Optional[Exception] = None, timing: Optional[ProbeTiming] = None) -> None:
+        """
+        Fan the table lookup of one endpoint back out to its checks.
+        
+        Args:
+            checks: Checks against the same endpoint
+            found: Dictionary mapping table names to whether they exist
+            error: Exception raised by the lookup, if it failed
+            timing: Connect and query time of the lookup
+        """
+        # Checks removed by a reload while they ran are dropped, their IDs may belong to new checks by now
+        checks = [check_config for check_config in checks if self._is_active(check_config)]
+        if not checks:
+            return
+        database_info = self._describe_database(checks[0])
+        connect_ms, query_ms = timing.milliseconds() if timing else (0.0, 0.0)
+        now = time.time()
+        if timing and not isinstance(error, CircuitOpenError):
+            self.metrics.observe_probe(checks[0].check_id, (connect_ms + query_ms) / 1000)
+        
+        if isinstance(error, CircuitOpenError):
+            logger.warning(f"Skipping {database_info}: {error}")
+        elif isinstance(error, CheckTimeout):
+            logger.error(f"Timeout for {database_info}: {error}")
+        elif error is not None:
+            logger.error(f"Database error for {database_info}: {error}")
+        
+        for check_config in checks:
+            if isinstance(error, CircuitOpenError):
+                status = 'circuit_open'
+            elif isinstance(error, CheckTimeout):
+                status = 'timeout'
+            elif (found or {}).get(check_config.table_name, False):
+                status = 'ok'
+            else:
+                status = 'missing'
             
-        except Exception as e:
-            logger.error(f"SQLite error for {db_path}: {e}")
-            return False
+            self.check_state.record_result(check_config.check_id, status, now)
+            self.check_history.record(check_config.check_id, status, connect_ms, query_ms, now)
+            self.metrics.record_result(check_config.check_id, status)
+            if self.events.active:
+                self.events.publish(check_config.check_id, 'result', {
+                    'id': check_config.check_id,
+                    'name': check_config.name,
+                    'table': check_config.table_name,
+                    'database': database_info,
+                    'result': status,
+                    'at': datetime.fromtimestamp(now).isoformat(),
+                    'connect_ms': round(connect_ms, 2),
+                    'query_ms': round(query_ms, 2)
+                })
+            try:
+                self._report_check_result(check_config, status)
+            except Exception as e:
+                logger.error(f"Error performing check '{check_config.name}': {e}")
     
-    def check_table_postgres(self, host: str, database: str, user: str, 
-                           password: str, table_name: str, port: int = 5432) -> bool:
+    def _probe_group(self, checks: List[CheckConfig], timing: Optional[ProbeTiming] = None,
+                     claim: Optional[ProbeClaim] = None) -> Dict[str, bool]:
         """
-        Check if table exists in PostgreSQL database.
+        Look up the tables of all checks against one database.
         
         Args:
-            host: Database host
-            database: Database name
-            user: Username
-            password: Password
-            table_name: Name of table to check
-            port: Database port (default 5432)
+            checks: Checks sharing the same endpoint
+            timing: Filled with the connect and query time of the lookup
+            claim: Shared with the deadline enforcement, the breaker only
+                records the outcome if the deadline has not claimed it already
             
         Returns:
-            True if table exists, False otherwise
+            Dictionary mapping table names to whether they exist
+            
+        Raises:
+            CheckTimeout: If the database did not answer within the deadline
+            CircuitOpenError: If the endpoint's circuit breaker rejected the lookup
         """
+        first = checks[0]
+        table_names = sorted({check_config.table_name for check_config in checks})
+        timeout = self._group_timeout(checks)
+        breaker = self._breaker(checks)
+        
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open after {breaker.failures} consecutive failures")
+        
+        token = current_probe_timing.set(timing)
         try:
-            conn = psycopg2.connect(
-                host=host,
-                database=database,
-                user=user,
-                password=password,
-                port=port
-            )
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_schema = 'public' 
-                    AND table_name = %s
-                )
-            """, (table_name,))
-            
-            result = cursor.fetchone()[0]
-            conn.close()
-            
-            return result
-            
+            found = first.driver.probe(first.settings, table_names, timeout)
         except Exception as e:
-            logger.error(f"PostgreSQL error for {host}:{port}/{database}: {e}")
-            return False
+            if claim is None or claim.claim():
+                breaker.record_failure(str(e))
+            raise
+        finally:
+            current_probe_timing.reset(token)
+            if timing:
+                timing.finish()
+        
+        if claim is None or claim.claim():
+            breaker.record_success()
+        return found
     
-    def send_email_alert(self, to_email: str, table_name: str, database_info: str, 
-                      check_name: str = None) -> bool:
+    async def _probe_group_async(self, checks: List[CheckConfig],
+                                 timing: Optional[ProbeTiming] = None) -> Dict[str, bool]:
         """
-        Send email alert when table is not found.
+        Look up the tables of all checks against one database on the event loop.
+        
+        The deadline is enforced with asyncio.wait_for, which cancels the
+        lookup and discards its connection when it expires.
         
         Args:
-            to_email: Recipient email address
-            table_name: Name of missing table
-            database_info: Database information for context
-            check_name: Name of the check (for cooldown tracking)
+            checks: Checks sharing the same endpoint
+            timing: Filled with the connect and query time of the lookup
             
         Returns:
-            True if email sent successfully, False otherwise
-        """
-        # Check cooldown if check_name provided
-        if check_name and not self.should_send_alert(check_name):
-            logger.info(f"Skipping alert for '{check_name}' - still in cooldown period")
-            return False
+            Dictionary mapping table names to whether they exist
             
+        Raises:
+            CheckTimeout: If the database did not answer within the deadline
+            CircuitOpenError: If the endpoint's circuit breaker rejected the lookup
+        """
+        first = checks[0]
+        table_names = sorted({check_config.table_name for check_config in checks})
+        timeout = self._group_timeout(checks)
+        breaker = self._breaker(checks)
+        
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open after {breaker.failures} consecutive failures")
+        
+        probe = first.driver.probe_async(first.settings, table_names, timeout)
+        
+        # wait_for runs the probe in a task that copies this context, timing included
+        token = current_probe_timing.set(timing)
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            subject = f"⚠️ DATABASE ALERT: Table '{table_name}' not found"
-            message_body = f"⚠️ ALERT [{timestamp}]:\n\nTable '{table_name}' not found in database {database_info}.\n\nPlease check immediately."
-            
-            # Create the email message
-            msg = MIMEMultipart()
-            msg['From'] = self.gmail_sender
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            
-            # Attach the message body
-            msg.attach(MIMEText(message_body, 'plain'))
-            
-            # Connect to Gmail SMTP server and send email
-            server = smtplib.SMTP('smtp.gmail.com', 587)
-            server.starttls()
-            server.login(self.gmail_user, self.gmail_password)
-            server.send_message(msg)
-            server.quit()
-            
-            # Update last alert time
-            if check_name:
-                self.last_alert_times[check_name] = datetime.now()
-            
-            logger.info(f"Email alert sent successfully to {to_email}")
-            return True
-            
+            found = await asyncio.wait_for(probe, timeout)
+        except asyncio.TimeoutError:
+            breaker.record_failure(f"No answer within {timeout}s")
+            raise CheckTimeout(f"No answer within {timeout}s")
         except Exception as e:
-            logger.error(f"Email sending failed: {e}")
-            return False
+            breaker.record_failure(str(e))
+            raise
+        finally:
+            current_probe_timing.reset(token)
+            if timing:
+                timing.finish()
+        
+        breaker.record_success()
+        return found
     
-    def perform_single_check(self, check_config: Dict) -> None:
+    def perform_check_group(self, checks: List[CheckConfig]) -> None:
         """
-        Perform a single database check based on configuration.
+        Perform all checks against one database with a single table lookup.
         
         Args:
-            check_config: Dictionary containing check configuration
+            checks: Checks sharing the same endpoint
         """
-        check_name = check_config.get('name', 'Unnamed Check')
-        check_type = check_config.get('type')
-        table_name = check_config.get('table_name')
-        alert_email = check_config.get('alert_email')
+        timing = ProbeTiming()
+        try:
+            found = self._probe_group(checks, timing)
+        except Exception as e:
+            self._report_group_outcome(checks, error=e, timing=timing)
+            return
         
-        table_exists = False
-        db_info = ""
+        self._report_group_outcome(checks, found, timing=timing)
+    
+    async def perform_check_group_async(self, checks: List[CheckConfig]) -> None:
+        """
+        Perform all checks against one database on the asyncio engine.
         
+        Args:
+            checks: Checks sharing the same endpoint
+        """
+        timing = ProbeTiming()
         try:
-            if check_type == 'sqlite':
-                db_path = check_config.get('db_path')
-                table_exists = self.check_table_sqlite(db_path, table_name)
-                db_info = f"SQLite: {db_path}"
-                
-            elif check_type == 'postgres':
-                table_exists = self.check_table_postgres(
-                    check_config['host'],
-                    check_config['database'],
-                    check_config['user'],
-                    check_config['password'],
-                    table_name,
-                    check_config.get('port', 5432)
-                )
-                db_info = f"PostgreSQL: {check_config['host']}:{check_config.get('port', 5432)}/{check_config['database']}"
-                
-            if table_exists:
-                logger.info(f"✅ [{check_name}] Table '{table_name}' exists")
-            else:
-                logger.warning(f"❌ [{check_name}] Table '{table_name}' NOT FOUND")
-                self.send_email_alert(alert_email, table_name, db_info, check_name)
-                
+            found = await self._probe_group_async(checks, timing)
         except Exception as e:
-            logger.error(f"Error performing check '{check_name}': {e}")
+            self._report_group_outcome(checks, error=e, timing=timing)
+            return
+        
+        self._report_group_outcome(checks, found, timing=timing)
+    
+    def perform_single_check(self, check_config: CheckConfig) -> None:
+        """
+        Perform a single database check based on configuration.
+        
+        Args:
+            check_config: Check configuration
+        """
+        self.perform_check_group([check_config])
+    
+    async def perform_single_check_async(self, check_config: CheckConfig) -> None:
+        """
+        Perform a single database check on the asyncio engine.
+        
+        Args:
+            check_config: Check configuration
+        """
+        await self.perform_check_group_async([check_config])
+    
+    def _connection_pools(self) -> List[ConnectionPool]:
+        """
+        Get the connection pools of all backend drivers.
+        
+        Returns:
+            List of connection pools
+        """
+        return [pool for driver in self.backends.values() for pool in driver.pools().values()]
+    
+    def _evict_idle_connections(self) -> None:
+        """
+        Close pooled connections that have been idle too long.
+        """
+        for pool in self._connection_pools():
+            pool.evict_idle()
+    
+    def _run_groups_with_deadlines(self, groups: List[List[CheckConfig]]) -> None:
+        """
+        Run batched lookups on the worker pool and enforce their deadlines.
+        
+        A lookup's deadline starts when a worker picks it up. Lookups still
+        running at their deadline are reported as timed out right away; the
+        driver timeouts release the worker shortly after and the late result
+        is discarded without reaching the circuit breaker, which has already
+        counted the timeout.
+        
+        Args:
+            groups: Check groups, one per endpoint
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                               thread_name_prefix='db-check')
+        
+        started_at = {}
+        timings = {}
+        claims = [ProbeClaim() for _ in groups]
+        
+        def probe(index: int, checks: List[CheckConfig]) -> Dict[str, bool]:
+            started_at[index] = time.monotonic()
+            timings[index] = ProbeTiming()
+            return self._probe_group(checks, timings[index], claims[index])
+        
+        def collect(future, index: int, checks: List[CheckConfig]) -> None:
+            try:
+                found = future.result()
+            except Exception as e:
+                self._report_group_outcome(checks, error=e, timing=timings.get(index))
+                return
+            self._report_group_outcome(checks, found, timing=timings[index])
+        
+        pending = {self.executor.submit(probe, index, checks): (index, checks)
+                   for index, checks in enumerate(groups)}
+        
+        while pending:
+            now = time.monotonic()
+            deadlines = [started_at[index] + self._group_timeout(checks)
+                         for index, checks in pending.values() if index in started_at]
+            # A lookup that starts now expires no earlier than the shortest timeout
+            next_deadline = min(deadlines + [now + min(self._group_timeout(checks) for _, checks in pending.values())])
+            done, _ = wait(pending, timeout=max(0, next_deadline - now), return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                index, checks = pending.pop(future)
+                collect(future, index, checks)
+            
+            now = time.monotonic()
+            for future, (index, checks) in list(pending.items()):
+                if index in started_at and now >= started_at[index] + self._group_timeout(checks):
+                    del pending[future]
+                    if not claims[index].claim():
+                        # The worker finished right at the deadline and is returning its result
+                        collect(future, index, checks)
+                        continue
+                    error = CheckTimeout(f"No answer within {self._group_timeout(checks)}s")
+                    self._breaker(checks).record_failure(str(error))
+                    self._report_group_outcome(checks, error=error, timing=timings.get(index))
+    
+    def run_checks(self, checks: List[CheckConfig], groups: Optional[List[List[CheckConfig]]] = None) -> None:
+        """
+        Run a set of database checks, batched per database.
+        
+        Each endpoint costs one table lookup. With CHECK_MAX_WORKERS above 1
+        the endpoints are spread over a worker pool, so the run takes as long
+        as the slowest endpoint instead of the sum of all of them, and no
+        endpoint can take longer than its CHECK_TIMEOUT.
+        
+        Args:
+            checks: Check configurations to run
+            groups: The same checks grouped per database, grouped here if omitted
+        """
+        if self.engine == 'asyncio':
+            asyncio.run(self.run_checks_async(checks, groups))
+            return
+        
+        if groups is None:
+            groups = list(self._group_checks(checks).values())
+        
+        logger.info(f"Running {len(checks)} database checks against {len(groups)} databases...")
+        started = time.monotonic()
+        
+        if self.max_workers <= 1:
+            for group in groups:
+                self.perform_check_group(group)
+        else:
+            self._run_groups_with_deadlines(groups)
+        
+        self._evict_idle_connections()
+        if self.alert_digest == 'cycle':
+            self.flush_alert_digests()
+        self._persist_state()
+        self._publish_status()
+        self.metrics.observe_cycle(time.monotonic() - started)
+        logger.info(f"Finished {len(checks)} checks in {time.monotonic() - started:.2f}s")
+    
+    async def run_checks_async(self, checks: List[CheckConfig], groups: Optional[List[List[CheckConfig]]] = None) -> None:
+        """
+        Run a set of database checks concurrently on the event loop.
+        
+        Checks are batched per database like run_checks, and at most
+        CHECK_ASYNC_CONCURRENCY databases are queried at once.
+        
+        Args:
+            checks: Check configurations to run
+            groups: The same checks grouped per database, grouped here if omitted
+        """
+        if groups is None:
+            groups = list(self._group_checks(checks).values())
+        
+        logger.info(f"Running {len(checks)} database checks against {len(groups)} databases (asyncio)...")
+        started = time.monotonic()
+        
+        limit = asyncio.Semaphore(self.max_async_checks)
+        
+        async def run_group(group: List[CheckConfig]) -> None:
+            async with limit:
+                await self.perform_check_group_async(group)
+        
+        await asyncio.gather(*(run_group(group) for group in groups))
+        
+        self._evict_idle_connections()
+        if self.alert_digest == 'cycle':
+            self.flush_alert_digests()
+        await asyncio.to_thread(self._persist_state)
+        self._publish_status()
+        self.metrics.observe_cycle(time.monotonic() - started)
+        logger.info(f"Finished {len(checks)} checks in {time.monotonic() - started:.2f}s")
     
     def run_all_checks(self) -> None:
         """
@@ -416,31 +2472,222 @@ POSTGRES_USER=myuser
         if not self.checks_config:
             logger.warning("No checks configured")
             return
-            
-        logger.info(f"Running {len(self.checks_config)} database checks...")
         
+        self.run_checks(self.checks_config, list(self.check_groups.values()))
+    
+    async def run_all_checks_async(self) -> None:
+        """
+        Run all configured database checks on the event loop.
+        """
+        if not self.checks_config:
+            logger.warning("No checks configured")
+            return
+        
+        await self.run_checks_async(self.checks_config, list(self.check_groups.values()))
+    
+    def _schedule_checks(self) -> None:
+        """
+        Put every configured check on the scheduler at its own interval.
+        """
+        self.scheduler.clear()
+        for check_config in self.checks_config:
+            self._schedule(check_config)
+    
+    def _schedule(self, check_config: CheckConfig) -> None:
+        """
+        Put a check on the scheduler, replacing its current schedule.
+        
+        Checks against the same database with the same interval share one
+        scheduler group, so they become due together and keep sharing one
+        table lookup and one alert digest after the first cycle.
+        
+        Args:
+            check_config: Check configuration
+        """
+        self.scheduler.add(check_config.check_id, check_config.interval,
+                           group=(self._endpoint_key(check_config), check_config.interval))
+    
+    def _pop_due_checks(self) -> List[CheckConfig]:
+        """
+        Take the checks whose next run is due from the scheduler.
+        
+        Returns:
+            List of due check configurations
+        """
+        checks_by_id = self.checks_by_id
+        return [checks_by_id[check_id] for check_id in self.scheduler.pop_due() if check_id in checks_by_id]
+    
+    def _wake(self) -> None:
+        """
+        Wake the monitoring loop so it re-reads the schedule and running state.
+        """
+        self.wake_event.set()
+        loop, async_wake = self.loop, self.async_wake
+        if loop is not None and async_wake is not None:
+            try:
+                loop.call_soon_threadsafe(async_wake.set)
+            except RuntimeError:
+                pass  # The event loop has already shut down
+    
+    def run_now(self, check_ids: Optional[List[int]] = None) -> None:
+        """
+        Run checks immediately instead of waiting for their schedule.
+        
+        While monitoring, the checks are handed to the monitoring loop and
+        their regular schedule is kept. Otherwise they run in the calling thread.
+        
+        Args:
+            check_ids: IDs of the checks to run, all checks if None
+        """
+        if not self.is_running:
+            checks_by_id = self.checks_by_id
+            checks = self.checks_config if check_ids is None else [
+                checks_by_id[check_id] for check_id in check_ids if check_id in checks_by_id]
+            self.run_checks(checks)
+            return
+        
+        self.scheduler.run_now(check_ids)
+        self._wake()
+    
+    def _start_sqlite_watcher(self) -> None:
+        """
+        Watch the files of SQLite checks and re-check a database when it changes.
+        
+        Regular polling keeps running as a safety net, so its interval can be
+        raised for watched databases.
+        """
+        checks_by_path = {}
+        configured_paths = {}  # Watched absolute path -> path as configured, which keys the schema cache
         for check_config in self.checks_config:
-            self.perform_single_check(check_config)
+            if check_config.type == 'sqlite':
+                db_path = os.path.abspath(check_config.settings['db_path'])
+                checks_by_path.setdefault(db_path, []).append(check_config.check_id)
+                configured_paths[db_path] = check_config.settings['db_path']
+        if not checks_by_path:
+            return
+        if not inotify_available():
+            logger.warning("SQLITE_WATCH=inotify is not supported on this platform, falling back to polling")
+            return
+        
+        def on_change(db_paths: List[str]) -> None:
+            if not self.is_running:
+                return  # Shutting down, do not run checks on the watcher thread
+            # Drop the events of our own probes; replaced files and schema changes alter the fingerprint
+            sqlite_driver = self.backends['sqlite']
+            db_paths = [db_path for db_path in db_paths if sqlite_driver.schema_changed(configured_paths[db_path])]
+            if not db_paths:
+                return
+            check_ids = [check_id for db_path in db_paths for check_id in checks_by_path.get(db_path, [])]
+            logger.info(f"SQLite file change detected, re-checking {', '.join(db_paths)}")
+            self.run_now(check_ids)
+        
+        watcher = InotifyWatcher(on_change, debounce=self.sqlite_watch_debounce)
+        try:
+            watcher.start(list(checks_by_path))
+        except OSError as e:
+            logger.warning(f"Could not start SQLite file watcher, falling back to polling: {e}")
+            return
+        self.sqlite_watcher = watcher
+    
+    async def monitoring_loop_async(self) -> None:
+        """
+        Monitoring loop for the asyncio engine, runs in a single event loop.
+        """
+        logger.info(f"Starting asyncio monitoring loop for {len(self.scheduler)} scheduled checks")
+        self.async_wake = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+        
+        while self.is_running:
+            try:
+                self.async_wake.clear()
+                due = self._pop_due_checks()
+                if due:
+                    await self.run_checks_async(due)
+                
+                # Sleep until the next check is due or stop_monitoring/run_now wakes us
+                next_due = self.scheduler.next_due()
+                timeout = None if next_due is None else max(0, next_due - time.monotonic())
+                try:
+                    await asyncio.wait_for(self.async_wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                    
+            except Exception as e:
+                logger.error(f"Error in monitoring loop: {e}")
+                await asyncio.sleep(10)  # Brief pause before retrying
+        
+        self.loop = None
+        self.async_wake = None
     
     def monitoring_loop(self) -> None:
         """
-        Main monitoring loop that runs checks at specified intervals.
+        Main monitoring loop that runs each check when its schedule is due.
         """
-        logger.info(f"Starting monitoring loop with {self.check_interval}s interval")
+        logger.info(f"Starting monitoring loop for {len(self.scheduler)} scheduled checks")
         
         while self.is_running:
             try:
-                self.run_all_checks()
+                self.wake_event.clear()
+                due = self._pop_due_checks()
+                if due:
+                    self.run_checks(due)
                 
-                # Sleep in small chunks to allow for responsive stopping
-                sleep_time = 0
-                while sleep_time < self.check_interval and self.is_running:
-                    time.sleep(1)
-                    sleep_time += 1
+                # Sleep until the next check is due or stop_monitoring/run_now wakes us
+                next_due = self.scheduler.next_due()
+                self.wake_event.wait(None if next_due is None else max(0, next_due - time.monotonic()))
                     
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
-                time.sleep(10)  # Brief pause before retrying
+                self.wake_event.wait(10)  # Brief pause before retrying
+    
+    def _start_postgres_listener(self) -> None:
+        """
+        Listen for DDL notifications from every PostgreSQL database and re-check it when one arrives.
+        
+        Each database needs an event trigger on ddl_command_end and sql_drop
+        that NOTIFYs the channel; with POSTGRES_WATCH=install it is created
+        when missing. Regular polling keeps running as a safety net.
+        """
+        keys = [key for key in self.check_groups if key[0] == 'postgres']
+        if not keys:
+            return
+        
+        def on_notify(key: tuple) -> None:
+            checks = self.check_groups.get(key)  # Looked up on each notification to follow reloads
+            if not self.is_running or not checks:
+                return
+            logger.info(f"DDL change notified, re-checking {self._describe_database(checks[0])}")
+            self.run_now([check_config.check_id for check_config in checks])
+        
+        listener = PostgresListener(on_notify, channel=self.postgres_watch_channel,
+                                    install=self.postgres_watch == 'install')
+        for key in keys:
+            self._listen_postgres(listener, key)
+        listener.start()
+        self.postgres_listener = listener
+    
+    def _listen_postgres(self, listener: PostgresListener, key: tuple) -> None:
+        """
+        Register the PostgreSQL database of a check group with the DDL listener.
+        
+        Args:
+            listener: The PostgresListener
+            key: Endpoint key of the check group
+        """
+        check_config = self.check_groups[key][0]
+        settings = check_config.settings
+        listener.add(
+            key,
+            self._describe_database(check_config),
+            host=settings['host'],
+            database=settings['database'],
+            user=settings['user'],
+            password=settings['password'],
+            port=settings['port'],
+            connect_timeout=max(2, math.ceil(self.check_timeout)),
+            # Detect a silently dropped LISTEN connection within about two minutes
+            keepalives=1, keepalives_idle=60, keepalives_interval=10, keepalives_count=6
+        )
     
     def start_monitoring(self) -> None:
         """
@@ -454,9 +2701,24 @@ POSTGRES_USER=myuser
             logger.error("No checks configured. Cannot start monitoring.")
             return
             
+        self._schedule_checks()
         self.is_running = True
-        self.check_thread = threading.Thread(target=self.monitoring_loop, daemon=True)
+        if self.engine == 'asyncio':
+            target = lambda: asyncio.run(self.monitoring_loop_async())
+        else:
+            target = self.monitoring_loop
+        self.check_thread = threading.Thread(target=target, daemon=True)
         self.check_thread.start()
+        self.start_status_server()
+        if self.sqlite_watch == 'inotify':
+            self._start_sqlite_watcher()
+        if self.postgres_watch != 'off':
+            self._start_postgres_listener()
+        if self.checks_file and self.checks_file_poll > 0:
+            self.config_watch_stop.clear()
+            self.config_watch_thread = threading.Thread(target=self._watch_checks_file,
+                                                        name='checks-file-watcher', daemon=True)
+            self.config_watch_thread.start()
         
         logger.info("Monitoring started in background thread")
     
@@ -470,16 +2732,54 @@ POSTGRES_USER=myuser
             
         logger.info("Stopping monitoring...")
         self.is_running = False
+        self._wake()
+        
+        if self.status_server:
+            self.status_server.stop()
+            self.status_server = None
+        with self.status_publish_lock:
+            if self.status_publish_timer is not None:
+                self.status_publish_timer.cancel()
+                self.status_publish_timer = None
+        if self.config_watch_thread:
+            self.config_watch_stop.set()
+            self.config_watch_thread.join(timeout=5)
+            self.config_watch_thread = None
+        if self.sqlite_watcher:
+            self.sqlite_watcher.stop()
+            self.sqlite_watcher = None
+        if self.postgres_listener:
+            self.postgres_listener.stop()
+            self.postgres_listener = None
         
         if self.check_thread and self.check_thread.is_alive():
             self.check_thread.join(timeout=5)
+        
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        
+        for pool in self._connection_pools():
+            pool.close_all()
+        if self.digest_timer:
+            self.digest_timer.cancel()
+        self.flush_alert_digests()
+        self.alert_sender.stop()
+        if self.state_store:
+            self._persist_state(force=True)
+            with self.state_flush_lock:
+                self.state_store.close()
+                self.state_store = None
             
         logger.info("Monitoring stopped")
     
-    def get_status(self) -> Dict:
+    def get_status(self, include_history: bool = False) -> Dict:
         """
         Get current monitoring status.
         
+        Args:
+            include_history: Add the buffered results of each check, oldest first
+            
         Returns:
             Dictionary with status information
         """
@@ -487,10 +2787,31 @@ POSTGRES_USER=myuser
             'is_running': self.is_running,
             'check_interval': self.check_interval,
             'alert_cooldown': self.alert_cooldown,
+            'check_timeout': self.check_timeout,
+            'max_workers': self.max_workers,
+            'max_per_endpoint': self.max_per_endpoint,
+            'engine': self.engine,
+            'connection_pools': {name: pool.stats() for driver in self.backends.values()
+                                 for name, pool in driver.pools().items()},
+            'alert_sender': self.alert_sender.stats(),
+            'schema_cache': self.schema_cache.stats(),
+            'state_store': self.state_store.stats() if self.state_store else None,
+            'event_stream': self.events.stats(),
+            'alert_digest': self.alert_digest,
+            'sqlite_watch': self.sqlite_watch,
+            'sqlite_watcher_active': self.sqlite_watcher is not None,
+            'postgres_watch': self.postgres_watch,
+            'postgres_listener': self.postgres_listener.stats() if self.postgres_listener else None,
+            'circuit_breakers': {self._describe_database(checks[0]): self._breaker(checks).snapshot()
+                                 for checks in self.check_groups.values()},
             'configured_checks': len(self.checks_config),
-            'checks': [{'name': check['name'], 'type': check['type'], 'table': check['table_name']} 
-                      for check in self.checks_config],
-            'last_alert_times': {k: v.isoformat() for k, v in self.last_alert_times.items()}
+            'checks_file': self.checks_file,
+            'history_size': self.history_size,
+            'checks': [{'id': check.check_id, 'name': check.name, 'type': check.type, 'table': check.table_name,
+                        'interval': check.interval, **self.check_state.snapshot(check.check_id),
+                        'latency': self.check_history.latency(check.check_id),
+                        **({'history': self.check_history.samples(check.check_id)} if include_history else {})}
+                      for check in self.checks_config]
         }
 
 def main():
@@ -514,6 +2835,9 @@ def main():
             checker.print_env_template()
             return
         
+        # Bind the status port before the first run, so the platform sees the web process come up
+        checker.start_status_server()
+        
         # Run checks once immediately
         logger.info("Running initial check...")
         checker.run_all_checks()
@@ -521,14 +2845,19 @@ def main():
         # Start continuous monitoring
         checker.start_monitoring()
         
-        # Keep the program running
+        # Keep the program running until Ctrl+C or SIGTERM (sent by the platform on redeploy)
+        shutdown = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: shutdown.set())
+        if hasattr(signal, 'SIGHUP'):
+            # Reload the check configuration off the signal handler, e.g. after `kill -HUP <pid>`
+            signal.signal(signal.SIGHUP, lambda signum, frame: threading.Thread(
+                target=checker.reload_checks, name='reload-checks', daemon=True).start())
         logger.info("Monitoring started. Press Ctrl+C to stop.")
-        while True:
-            time.sleep(60)  # Print status every minute
-            status = checker.get_status()
-            logger.info(f"Status: Running={status['is_running']}, "
-                       f"Checks={status['configured_checks']}, "
-                       f"Interval={status['check_interval']}s")
+        shutdown.wait()
+        
+        logger.info("Stopping monitoring...")
+        checker.stop_monitoring()
+        logger.info("Monitoring stopped. Goodbye!")
                        
     except ValueError as e:
         logger.error(f"Configuration error: {e}")
@@ -567,6 +2896,8 @@ services:
       # Monitoring Settings
       CHECK_INTERVAL: 300
       ALERT_COOLDOWN: 3600
+      CHECK_MAX_WORKERS: 8
+      CHECK_MAX_PER_ENDPOINT: 2
       
       # Database Check 1 - SQLite
       DB_CHECK_1_NAME: "User Sessions"
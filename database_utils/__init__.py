@@ -8,11 +8,27 @@ from .database import (
     create_mysql_connection,
     close_database_connection,
     test_database_connection,
-    table_exists
+    table_exists,
+    table_exists_async,
+    existing_tables
 )
+from .pool import ConnectionPool
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .scheduler import CheckScheduler
+from .schema_cache import SchemaCache, SchemaSnapshot
+from .check_state import CheckStateTable
+from .state_store import StateStore
+from .check_history import CheckHistory, ProbeTiming
+from .status_server import StatusServer, StatusSnapshot, build_snapshot
+from .metrics import CheckMetrics, HistogramArray
+from .event_stream import EventBroadcaster, Subscription
+from .catalog import iter_check_catalog, catalog_fields
+from .inotify_watcher import InotifyWatcher, inotify_available
+from .pg_listener import PostgresListener
 from .email_utils import (
     send_email,
-    send_missing_table_notification
+    send_missing_table_notification,
+    AlertSender
 )
 
 __all__ = [
@@ -21,6 +37,31 @@ __all__ = [
     'close_database_connection',
     'test_database_connection',
     'table_exists',
+    'table_exists_async',
+    'existing_tables',
+    'ConnectionPool',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'CheckScheduler',
+    'SchemaCache',
+    'SchemaSnapshot',
+    'CheckStateTable',
+    'StateStore',
+    'CheckHistory',
+    'ProbeTiming',
+    'StatusServer',
+    'StatusSnapshot',
+    'build_snapshot',
+    'CheckMetrics',
+    'HistogramArray',
+    'EventBroadcaster',
+    'Subscription',
+    'iter_check_catalog',
+    'catalog_fields',
+    'InotifyWatcher',
+    'inotify_available',
+    'PostgresListener',
     'send_email',
-    'send_missing_table_notification'
+    'send_missing_table_notification',
+    'AlertSender'
 ]
@@ -0,0 +1,201 @@
+"""
+File-based check catalogs.
+Reads check definitions from JSON, JSON Lines, TOML or YAML files, streaming the formats that allow it.
+"""
+import json
+import os
+import re
+from typing import Any, Dict, Iterator, Tuple
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+CHUNK_SIZE = 1 << 16
+
+# Characters a JSON number can continue with, at the end of a chunk the number may be cut off
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+
+# File extension -> catalog format
+CATALOG_FORMATS = {
+    '.json': 'json',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.toml': 'toml',
+    '.yaml': 'yaml',
+    '.yml': 'yaml'
+}
+
+
+def iter_check_catalog(path: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Iterate over the check entries of a catalog file.
+
+    JSON Lines files and JSON files holding a top-level array are streamed
+    entry by entry, so memory stays flat however many checks they hold.
+    JSON objects with a "checks" list, TOML files with [[checks]] tables and
+    YAML files are parsed as a whole.
+
+    Args:
+        path: Path of the catalog file, its extension selects the format
+
+    Yields:
+        Tuple of (source, entry) where source locates the entry for error messages
+
+    Raises:
+        ValueError: If the format is unsupported or the file is malformed
+        OSError: If the file cannot be read
+    """
+    catalog_format = CATALOG_FORMATS.get(os.path.splitext(path)[1].lower())
+    if catalog_format is None:
+        raise ValueError(f"Unsupported catalog file '{path}', use one of {', '.join(CATALOG_FORMATS)}")
+
+    if catalog_format == 'jsonl':
+        with open(path, encoding='utf-8') as f:
+            for line_num, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"{path}:{line_num}: {e}")
+                    yield f"{path}:{line_num}", entry
+        return
+
+    if catalog_format == 'json':
+        with open(path, encoding='utf-8') as f:
+            start = f.read(CHUNK_SIZE)
+            if start.lstrip().startswith('['):
+                for index, entry in enumerate(_iter_json_array(f, start)):
+                    yield f"{path}[{index}]", entry
+                return
+            document = json.loads(start + f.read())
+    elif catalog_format == 'toml':
+        if tomllib is None:
+            raise ValueError("TOML catalogs need Python 3.11+ or the tomli package")
+        with open(path, 'rb') as f:
+            document = tomllib.load(f)
+    else:
+        if yaml is None:
+            raise ValueError("YAML catalogs need the PyYAML package")
+        with open(path, encoding='utf-8') as f:
+            document = yaml.safe_load(f)
+
+    checks = document.get('checks') if isinstance(document, dict) else document
+    if not isinstance(checks, list):
+        raise ValueError(f"{path}: expected a list of checks or a 'checks' list")
+    for index, entry in enumerate(checks):
+        yield f"{path}[{index}]", entry
+
+
+def catalog_fields(entry: Any) -> Dict[str, str]:
+    """
+    Convert a catalog entry to the field mapping used for DB_CHECK_N_* variables.
+
+    Keys are upper-cased, so "table_name" matches TABLE_NAME, and scalar
+    values are converted to strings.
+
+    Args:
+        entry: One check entry of a catalog
+
+    Returns:
+        Dictionary mapping field names to values
+
+    Raises:
+        ValueError: If the entry is not a mapping of scalar values
+    """
+    if not isinstance(entry, dict):
+        raise ValueError("entry is not a mapping")
+    fields = {}
+    for key, value in entry.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        elif isinstance(value, (dict, list)):
+            raise ValueError(f"setting '{key}' must be a single value")
+        fields[str(key).upper()] = str(value)
+    return fields
+
+
+def _iter_json_array(stream, buffer: str) -> Iterator[Any]:
+    """
+    Decode the elements of a top-level JSON array one chunk at a time.
+
+    An element is only yielded once it is known to be complete, i.e. when
+    more text follows it that cannot continue it (a number at the end of a
+    chunk may go on in the next one). Elements must be separated by ','
+    and nothing but whitespace may follow the closing ']'.
+
+    Args:
+        stream: Text stream positioned after buffer
+        buffer: Text read so far, starting with the opening '['
+
+    Yields:
+        The array elements in order
+
+    Raises:
+        ValueError: If the array is malformed
+    """
+    decoder = json.JSONDecoder()
+    pos = buffer.index('[') + 1
+    eof = False
+    expect_value = True
+    first = True
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+
+        if pos < len(buffer):
+            char = buffer[pos]
+            if not expect_value:
+                if char == ']':
+                    pos += 1
+                    break
+                if char != ',':
+                    raise ValueError(f"expected ',' or ']' in JSON catalog, found {char!r}")
+                pos += 1
+                expect_value = True
+                first = False
+                continue
+            if char == ']':
+                if not first:
+                    raise ValueError("trailing ',' before ']' in JSON catalog")
+                pos += 1
+                break
+            try:
+                entry, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # Text up to the buffer end that could still continue a number means the value may be cut off
+                if eof or not _NUMBER_TAIL.fullmatch(buffer, end):
+                    yield entry
+                    pos = end
+                    expect_value = False
+                    continue
+        elif eof:
+            raise ValueError("unexpected end of JSON catalog, missing ']'")
+
+        more = stream.read(CHUNK_SIZE)
+        eof = not more
+        buffer = buffer[pos:] + more
+        pos = 0
+
+    # Nothing but whitespace may follow the array
+    rest = buffer[pos:]
+    while True:
+        if rest.strip():
+            raise ValueError("unexpected data after the closing ']' of the JSON catalog")
+        rest = stream.read(CHUNK_SIZE)
+        if not rest:
+            return
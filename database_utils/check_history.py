@@ -0,0 +1,204 @@
+"""
+Recent result history per check.
+Keeps the last results of every check with their connect and query latency in fixed-size
+ring buffers backed by flat arrays indexed by check ID.
+"""
+import contextvars
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+from .check_state import STATUSES, STATUS_CODES
+
+# Sample as spilled to storage: (check_id, unix time, status, connect ms, query ms)
+HistorySample = Tuple[int, float, str, float, float]
+
+
+class ProbeTiming:
+    """
+    Connect and query time of one probe, filled in while it runs.
+
+    Connection code reports the time it spent connecting with
+    record_connect(); everything else the probe took counts as query time.
+    """
+
+    __slots__ = ('started', 'connect', 'total')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.connect = 0.0
+        self.total: Optional[float] = None
+
+    def finish(self) -> None:
+        """
+        Stop the clock, the probe has returned or failed.
+        """
+        self.total = time.perf_counter() - self.started
+
+    def milliseconds(self) -> Tuple[float, float]:
+        """
+        Get connect and query time, measured up to now if the probe is still running.
+
+        Returns:
+            Tuple of (connect ms, query ms)
+        """
+        total = self.total if self.total is not None else time.perf_counter() - self.started
+        return self.connect * 1000, max(0.0, total - self.connect) * 1000
+
+
+# Timing of the probe running in the current thread or task, set by the checker
+current_probe_timing: contextvars.ContextVar = contextvars.ContextVar('current_probe_timing', default=None)
+
+
+def record_connect(started: float) -> None:
+    """
+    Add the time since started to the connect time of the running probe, if any.
+
+    Args:
+        started: time.perf_counter() value from before connecting
+    """
+    timing = current_probe_timing.get()
+    if timing is not None:
+        timing.connect += time.perf_counter() - started
+
+
+class CheckHistory:
+    """
+    Ring buffer of the last depth results of every check.
+
+    All checks share one typed array per field, check N owning slots
+    N * depth to N * depth + depth - 1, so memory is fixed at about
+    17 bytes per sample no matter how long the checker runs. With spill
+    enabled, recorded samples are also queued until take_spilled() hands
+    them to persistent storage.
+    """
+
+    def __init__(self, depth: int = 60, size: int = 0, spill: bool = False):
+        """
+        Create a history.
+
+        Args:
+            depth: Samples kept per check
+            size: Number of check IDs to allocate
+            spill: Queue every sample for take_spilled()
+        """
+        self.depth = max(1, depth)
+        self.at = array('d')
+        self.result = array('B')
+        self.connect_ms = array('f')
+        self.query_ms = array('f')
+        self.next_slot = array('I')
+        self.count = array('I')
+        self.spill = spill
+        self._spilled: List[HistorySample] = []
+        self._spill_lock = threading.Lock()
+        self.resize(size)
+
+    def resize(self, size: int) -> None:
+        """
+        Grow the history to hold check IDs 0 to size - 1; it never shrinks.
+
+        Args:
+            size: Number of check IDs
+        """
+        grow = size - len(self.count)
+        if grow <= 0:
+            return
+        for column in (self.at, self.result, self.connect_ms, self.query_ms):
+            column.extend([0] * (grow * self.depth))
+        self.next_slot.extend([0] * grow)
+        self.count.extend([0] * grow)
+
+    def clear(self, check_id: int) -> None:
+        """
+        Drop the buffered and not yet spilled results of a check ID, so it can be given to another check.
+
+        Args:
+            check_id: Check ID
+        """
+        self.next_slot[check_id] = 0
+        self.count[check_id] = 0
+        if self.spill:
+            with self._spill_lock:
+                self._spilled = [sample for sample in self._spilled if sample[0] != check_id]
+
+    def record(self, check_id: int, status: str, connect_ms: float, query_ms: float,
+               at: Optional[float] = None) -> None:
+        """
+        Add a result, overwriting the oldest one once the check's buffer is full.
+
+        Args:
+            check_id: Check ID
+            status: One of STATUSES
+            connect_ms: Milliseconds spent connecting
+            query_ms: Milliseconds spent querying
+            at: Unix time of the result, defaults to now
+        """
+        at = time.time() if at is None else at
+        slot = self.next_slot[check_id]
+        index = check_id * self.depth + slot
+        self.at[index] = at
+        self.result[index] = STATUS_CODES[status]
+        self.connect_ms[index] = connect_ms
+        self.query_ms[index] = query_ms
+        self.next_slot[check_id] = (slot + 1) % self.depth
+        if self.count[check_id] < self.depth:
+            self.count[check_id] += 1
+        if self.spill:
+            with self._spill_lock:
+                self._spilled.append((check_id, at, status, connect_ms, query_ms))
+
+    def samples(self, check_id: int) -> List[Dict[str, Union[str, float]]]:
+        """
+        Get the buffered results of a check, oldest first.
+
+        Args:
+            check_id: Check ID
+
+        Returns:
+            List of dictionaries with at (ISO timestamp), result, connect_ms and query_ms
+        """
+        return [{
+            'at': datetime.fromtimestamp(self.at[index]).isoformat(),
+            'result': STATUSES[self.result[index]],
+            'connect_ms': round(self.connect_ms[index], 2),
+            'query_ms': round(self.query_ms[index], 2)
+        } for index in self._indexes(check_id)]
+
+    def latency(self, check_id: int) -> Dict[str, Optional[float]]:
+        """
+        Summarize the latency of a check's buffered results.
+
+        Args:
+            check_id: Check ID
+
+        Returns:
+            Dictionary with sample count and last, average and maximum connect and query ms
+        """
+        indexes = self._indexes(check_id)
+        summary = {'samples': len(indexes)}
+        for name, column in (('connect_ms', self.connect_ms), ('query_ms', self.query_ms)):
+            values = [column[index] for index in indexes]
+            summary[f'last_{name}'] = round(values[-1], 2) if values else None
+            summary[f'avg_{name}'] = round(sum(values) / len(values), 2) if values else None
+            summary[f'max_{name}'] = round(max(values), 2) if values else None
+        return summary
+
+    def take_spilled(self) -> List[HistorySample]:
+        """
+        Take the samples recorded since the last call.
+
+        Returns:
+            List of (check_id, unix time, status, connect ms, query ms)
+        """
+        with self._spill_lock:
+            spilled, self._spilled = self._spilled, []
+        return spilled
+
+    def _indexes(self, check_id: int) -> List[int]:
+        base = check_id * self.depth
+        count = self.count[check_id]
+        first = (self.next_slot[check_id] - count) % self.depth
+        return [base + (first + offset) % self.depth for offset in range(count)]
@@ -0,0 +1,223 @@
+"""
+Per-check runtime state.
+Keeps the last run, result, alert time and failure streak of every check in flat arrays indexed by check ID.
+"""
+import threading
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set, Union
+
+# Result codes stored in the state table, indexed by code
+STATUSES = ('unknown', 'ok', 'missing', 'timeout', 'circuit_open')
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+# Results that extend a check's failure streak; circuit_open skips the probe and leaves it as is
+FAILURE_STATUSES = frozenset(('missing', 'timeout'))
+
+
+class CheckStateTable:
+    """
+    Array-backed state of all checks, addressed by stable check ID.
+
+    Each field is one typed array, so the state of 10k checks takes a few
+    hundred kilobytes and no per-check objects. Timestamps are Unix times
+    with 0 meaning never. Single element reads and writes need no lock; the
+    table only grows while checks are running, so IDs in use stay valid, and
+    the IDs of removed checks are cleared and handed to new checks.
+    Changed check IDs are collected so a persistent store only has to write
+    those (see take_dirty).
+    """
+
+    def __init__(self, size: int = 0):
+        """
+        Create a state table.
+
+        Args:
+            size: Number of check IDs to allocate
+        """
+        self.last_run = array('d')
+        self.last_result = array('B')
+        self.last_alert = array('d')
+        self.failures = array('I')  # Consecutive missing or timeout results
+        self._dirty: Set[int] = set()
+        self._dirty_lock = threading.Lock()
+        self.resize(size)
+
+    def resize(self, size: int) -> None:
+        """
+        Grow or shrink the table to hold check IDs 0 to size - 1.
+
+        Existing state is kept, new checks start as never run.
+
+        Args:
+            size: Number of check IDs
+        """
+        for column in (self.last_run, self.last_result, self.last_alert, self.failures):
+            if size < len(column):
+                del column[size:]
+            else:
+                column.extend([0] * (size - len(column)))
+
+    def __len__(self) -> int:
+        return len(self.last_run)
+
+    def clear(self, check_id: int) -> None:
+        """
+        Reset a check ID to never run, so it can be given to another check.
+
+        Args:
+            check_id: Check ID
+        """
+        self.last_run[check_id] = 0
+        self.last_result[check_id] = 0
+        self.last_alert[check_id] = 0
+        self.failures[check_id] = 0
+        with self._dirty_lock:
+            self._dirty.discard(check_id)
+
+    def record_result(self, check_id: int, status: str, at: Optional[float] = None) -> None:
+        """
+        Record the outcome of a check run.
+
+        Args:
+            check_id: Check ID
+            status: One of STATUSES
+            at: Unix time of the run, defaults to now
+        """
+        self.last_run[check_id] = time.time() if at is None else at
+        self.last_result[check_id] = STATUS_CODES[status]
+        if status == 'ok':
+            self.failures[check_id] = 0
+        elif status in FAILURE_STATUSES:
+            self.failures[check_id] += 1
+        self._mark(check_id)
+
+    def result(self, check_id: int) -> str:
+        """
+        Get the last outcome of a check.
+
+        Args:
+            check_id: Check ID
+
+        Returns:
+            One of STATUSES, 'unknown' if the check has not run yet
+        """
+        return STATUSES[self.last_result[check_id]]
+
+    def record_alert(self, check_id: int, at: Optional[float] = None) -> None:
+        """
+        Record that an alert for a check was queued.
+
+        Args:
+            check_id: Check ID
+            at: Unix time of the alert, defaults to now
+        """
+        self.last_alert[check_id] = time.time() if at is None else at
+        self._mark(check_id)
+
+    def clear_alert(self, check_id: int) -> None:
+        """
+        Forget the last alert of a check so the next failure alerts again.
+
+        Args:
+            check_id: Check ID
+        """
+        self.last_alert[check_id] = 0
+        self._mark(check_id)
+
+    def in_cooldown(self, check_id: int, cooldown: float, now: Optional[float] = None) -> bool:
+        """
+        Check whether a check alerted less than cooldown seconds ago.
+
+        Args:
+            check_id: Check ID
+            cooldown: Cooldown in seconds
+            now: Unix time to compare against, defaults to now
+
+        Returns:
+            bool: True if a new alert should be suppressed
+        """
+        last_alert = self.last_alert[check_id]
+        return last_alert > 0 and (time.time() if now is None else now) - last_alert <= cooldown
+
+    def snapshot(self, check_id: int) -> Dict[str, Optional[str]]:
+        """
+        Get the state of a check for status reporting.
+
+        Args:
+            check_id: Check ID
+
+        Returns:
+            Dictionary with last run, last result, last alert (ISO timestamps or None)
+            and consecutive failures
+        """
+        return {
+            'last_run': _isoformat(self.last_run[check_id]),
+            'last_result': self.result(check_id),
+            'last_alert': _isoformat(self.last_alert[check_id]),
+            'consecutive_failures': self.failures[check_id]
+        }
+
+    def row(self, check_id: int) -> Dict[str, Union[float, str, int]]:
+        """
+        Get the raw state of a check for persisting it.
+
+        Args:
+            check_id: Check ID
+
+        Returns:
+            Dictionary with last_run, last_result, last_alert and failures
+        """
+        return {
+            'last_run': self.last_run[check_id],
+            'last_result': self.result(check_id),
+            'last_alert': self.last_alert[check_id],
+            'failures': self.failures[check_id]
+        }
+
+    def restore(self, check_id: int, last_run: float, last_result: str,
+                last_alert: float, failures: int) -> None:
+        """
+        Set the state of a check from a persisted row, without marking it changed.
+
+        Args:
+            check_id: Check ID
+            last_run: Unix time of the last run, 0 for never
+            last_result: One of STATUSES, unknown values restore as 'unknown'
+            last_alert: Unix time of the last alert, 0 for never
+            failures: Consecutive failures
+        """
+        self.last_run[check_id] = last_run or 0
+        self.last_result[check_id] = STATUS_CODES.get(last_result, 0)
+        self.last_alert[check_id] = last_alert or 0
+        self.failures[check_id] = max(0, failures or 0)
+
+    def take_dirty(self) -> Set[int]:
+        """
+        Take the IDs of checks whose state changed since the last call.
+
+        Returns:
+            Set of check IDs
+        """
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    def mark_dirty(self, check_ids: Iterable[int]) -> None:
+        """
+        Mark checks as changed again, e.g. after their state could not be written.
+
+        Args:
+            check_ids: Check IDs returned by take_dirty
+        """
+        with self._dirty_lock:
+            self._dirty.update(check_ids)
+
+    def _mark(self, check_id: int) -> None:
+        with self._dirty_lock:
+            self._dirty.add(check_id)
+
+
+def _isoformat(timestamp: float) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
@@ -0,0 +1,109 @@
+"""
+Circuit breaker for database endpoints.
+Stops hammering endpoints that keep failing and probes them with exponential backoff.
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of connecting while an endpoint's circuit is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker for one endpoint.
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    are rejected without touching the endpoint. Once the backoff has elapsed
+    a single probe is let through (half-open): success closes the circuit,
+    failure opens it again with the backoff doubled up to max_backoff.
+    """
+
+    def __init__(self, failure_threshold: int = 3, base_backoff: float = 60, max_backoff: float = 3600):
+        """
+        Create a closed circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            base_backoff: Seconds until the first probe after opening
+            max_backoff: Upper bound for the probe backoff in seconds
+        """
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = CLOSED
+        self.failures = 0
+        self.backoff = base_backoff
+        self.next_probe = 0.0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may go through to the endpoint.
+
+        Returns:
+            bool: True if the call should be attempted, False to short-circuit it
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() >= self.next_probe:
+                self.state = HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """
+        Record a successful call and close the circuit.
+        """
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.backoff = self.base_backoff
+            self.last_error = None
+
+    def record_failure(self, error: Optional[str] = None) -> None:
+        """
+        Record a failed call, opening the circuit if needed.
+
+        Args:
+            error: Description of the failure for status reporting
+        """
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            if self.state == HALF_OPEN:
+                # The probe failed, wait twice as long before the next one
+                self.backoff = min(self.backoff * 2, self.max_backoff)
+                self._open()
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self.backoff = self.base_backoff
+                self._open()
+
+    def snapshot(self) -> Dict:
+        """
+        Get the breaker state for status reporting.
+
+        Returns:
+            Dictionary with state, consecutive failures, seconds until the next probe and last error
+        """
+        with self._lock:
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'retry_in': round(max(0.0, self.next_probe - time.monotonic()), 1) if self.state == OPEN else 0,
+                'last_error': self.last_error
+            }
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.next_probe = time.monotonic() + self.backoff
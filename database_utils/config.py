@@ -45,7 +45,8 @@ def get_database_config() -> Dict[str, str]:
         'port': os.getenv('DB_PORT', '3306'),
         'database': os.getenv('DB_NAME', 'test'),
         'ssl_ca': os.getenv('DB_SSL_CA', ''),
-        'ssl_disabled': os.getenv('DB_SSL_DISABLED', 'true')  # Default to disabled for better compatibility
+        'ssl_disabled': os.getenv('DB_SSL_DISABLED', 'true'),  # Default to disabled for better compatibility
+        'connect_timeout': os.getenv('DB_CONNECT_TIMEOUT', '10')
     }
     
     # Print debug info (will be visible in logs)
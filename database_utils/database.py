@@ -2,20 +2,26 @@
 Database connection utilities.
 Provides functions for creating and managing database connections.
 """
+import asyncio
 import mysql.connector
 from mysql.connector import Error
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Set
 
-def create_mysql_connection(config: Optional[Dict[str, Any]] = None) -> Optional[mysql.connector.connection.MySQLConnection]:
+def create_mysql_connection(config: Optional[Dict[str, Any]] = None,
+                            raise_on_error: bool = False) -> Optional[mysql.connector.connection.MySQLConnection]:
     """
     Create a MySQL database connection.
     
     Args:
         config: Dictionary containing connection parameters.
                If None, will try to load from environment variables.
+        raise_on_error: Raise connection errors instead of printing them and returning None
                
     Returns:
         MySQLConnection: A database connection object if successful, None otherwise.
+        
+    Raises:
+        mysql.connector.Error: If connecting fails and raise_on_error is set
     """
     if config is None:
         from .config import get_database_config
@@ -30,6 +36,10 @@ def create_mysql_connection(config: Optional[Dict[str, Any]] = None) -> Optional
         'database': config['database']
     }
     
+    # Bound how long connecting and each read may block
+    if config.get('connect_timeout'):
+        conn_args['connection_timeout'] = int(float(config['connect_timeout']))
+    
     # Handle SSL configuration
     ssl_disabled = str(config.get('ssl_disabled', 'false')).lower() == 'true'
     
@@ -60,6 +70,8 @@ def create_mysql_connection(config: Optional[Dict[str, Any]] = None) -> Optional
         connection = mysql.connector.connect(**conn_args)
         return connection
     except Error as e:
+        if raise_on_error:
+            raise
         print(f"Error connecting to database: {e}")
         return None
 
@@ -134,3 +146,56 @@ def table_exists(connection, table_name: str) -> bool:
     except Error as e:
         print(f"[ERROR] Error checking for table {table_name}: {e}")
         return False
+
+
+def existing_tables(connection, table_names: Iterable[str]) -> Set[str]:
+    """
+    Find which of several tables exist in the connection's database with one query.
+    
+    Unlike table_exists, errors are raised so callers can tell a missing
+    table from an unreachable database.
+    
+    Args:
+        connection: Active database connection
+        table_names: Names of the tables to look up
+        
+    Returns:
+        set: Names of the requested tables that exist
+        
+    Raises:
+        mysql.connector.Error: If the lookup fails
+    """
+    table_names = list(table_names)
+    if not table_names:
+        return set()
+    
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"""
+            SELECT table_name
+            FROM information_schema.tables 
+            WHERE table_schema = DATABASE() 
+            AND table_name IN ({', '.join(['%s'] * len(table_names))})
+        """, table_names)
+        # The server's collation decides the match, it may return names in a different case
+        found = {row[0].lower() for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+    return {name for name in table_names if name.lower() in found}
+
+
+async def table_exists_async(connection, table_name: str) -> bool:
+    """
+    Check if a table exists in the database without blocking the event loop.
+    
+    mysql-connector-python has no asyncio driver in the pinned version, so the
+    lookup runs on the loop's default executor.
+    
+    Args:
+        connection: Active database connection
+        table_name: Name of the table to check
+        
+    Returns:
+        bool: True if table exists, False otherwise
+    """
+    return await asyncio.to_thread(table_exists, connection, table_name)
@@ -4,7 +4,15 @@ Email utilities for sending notifications.
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.message import Message
 import os
+import queue
+import threading
+import time
+import logging
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
 
 def send_email(subject: str, body: str, to_email: str, from_email: str, password: str = None) -> bool:
     """
@@ -73,3 +81,188 @@ def send_missing_table_notification(table_name: str, to_email: str, from_email:
     """
     
     send_email(subject, body, to_email, from_email, password)
+
+
+class AlertSender:
+    """
+    Background email sender with a queue and a reusable SMTP session.
+    
+    Messages are handed over with enqueue(), which never blocks the caller.
+    A single worker thread delivers them over one authenticated session that
+    is kept open between messages, closed after idle_timeout seconds without
+    traffic and reopened transparently if the server drops it.
+    """
+    
+    def __init__(self, user: str, password: str, host: str = 'smtp.gmail.com', port: int = 587,
+                 starttls: bool = True, idle_timeout: float = 60, max_queue: int = 1000,
+                 timeout: float = 30, observer: Optional[Callable[[bool, float], None]] = None):
+        """
+        Create a sender, the worker thread is started on the first enqueue().
+        
+        Args:
+            user: SMTP login user
+            password: SMTP login password (Gmail app password)
+            host: SMTP server host
+            port: SMTP server port
+            starttls: Upgrade the session with STARTTLS before logging in
+            idle_timeout: Seconds without messages before the session is closed
+            max_queue: Maximum number of queued messages
+            timeout: Socket timeout for SMTP operations in seconds
+            observer: Called on the sender thread after each delivery with success and seconds taken
+        """
+        self.user = user
+        self.password = password
+        self.host = host
+        self.port = port
+        self.starttls = starttls
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.observer = observer
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def enqueue(self, msg: Message, callback: Optional[Callable[[bool], None]] = None) -> bool:
+        """
+        Queue a message for delivery without blocking.
+        
+        Args:
+            msg: Email message to send
+            callback: Called on the sender thread with True if delivery succeeded
+            
+        Returns:
+            bool: True if the message was queued, False if the queue is full
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((msg, callback))
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            logger.error(f"Alert queue full, dropping message to {msg['To']}")
+            return False
+    
+    def stop(self, timeout: float = 10) -> None:
+        """
+        Deliver the queued messages and stop the worker thread.
+        
+        Args:
+            timeout: Maximum seconds to wait for the queue to drain
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        try:
+            self._queue.put((None, None), timeout=timeout)
+        except queue.Full:
+            logger.error("Alert queue did not drain, stopping sender anyway")
+            return
+        thread.join(timeout)
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get sender counters.
+        
+        Returns:
+            Dictionary with queued, sent, failed and dropped message counts
+        """
+        return {
+            'queued': self._queue.qsize(),
+            'sent': self.sent,
+            'failed': self.failed,
+            'dropped': self.dropped
+        }
+    
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='alert-sender', daemon=True)
+                self._thread.start()
+    
+    def _run(self) -> None:
+        while True:
+            try:
+                msg, callback = self._queue.get(timeout=self.idle_timeout if self._server else None)
+            except queue.Empty:
+                logger.debug("Closing idle SMTP session")
+                self._disconnect()
+                continue
+            
+            if msg is None:
+                self._disconnect()
+                return
+            
+            started = time.perf_counter()
+            ok = self._send(msg)
+            if self.observer:
+                self.observer(ok, time.perf_counter() - started)
+            if callback:
+                try:
+                    callback(ok)
+                except Exception as e:
+                    logger.error(f"Alert callback failed: {e}")
+    
+    def _send(self, msg: Message) -> bool:
+        for attempt in range(2):
+            reused = self._server is not None
+            try:
+                if self._server is None:
+                    self._connect()
+                self._server.send_message(msg)
+                self.sent += 1
+                logger.info(f"Email alert sent successfully to {msg['To']}")
+                return True
+            except smtplib.SMTPServerDisconnected as e:
+                self._disconnect()
+                if reused and attempt == 0:
+                    # The server closed the kept-alive session, reconnect once
+                    continue
+                logger.error(f"Email sending failed: {e}")
+            except smtplib.SMTPException as e:
+                # SMTPException subclasses OSError, so it must be caught before it: a rejected
+                # message leaves the session usable, reset it and keep it without retrying
+                logger.error(f"Email sending failed: {e}")
+                if self._server is not None:
+                    try:
+                        self._server.rset()
+                    except Exception:
+                        self._disconnect()
+            except OSError as e:
+                self._disconnect()
+                if reused and attempt == 0:
+                    # The kept-alive session broke at the socket level, reconnect once
+                    continue
+                logger.error(f"Email sending failed: {e}")
+            break
+        
+        self.failed += 1
+        return False
+    
+    def _connect(self) -> None:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                server.starttls()
+            server.ehlo()
+            if self.user and server.has_extn('auth'):
+                server.login(self.user, self.password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+    
+    def _disconnect(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            self._server.close()
+        self._server = None
@@ -0,0 +1,171 @@
+"""
+Live event stream.
+Fans check results out to server-sent event subscribers through bounded per-subscriber
+buffers, so a slow consumer can never hold up the checker.
+"""
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+
+class Subscription:
+    """
+    Pending events of one subscriber, at most max_pending of them.
+
+    Events carry a key (the check ID); a new event replaces a pending one
+    with the same key, so a slow consumer gets the latest result of each
+    check. When the buffer is full anyway the oldest event is dropped.
+    """
+
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.coalesced = 0
+        self.closed = False
+        self._pending: 'OrderedDict[Hashable, bytes]' = OrderedDict()
+        self._ready = threading.Condition()
+
+    def push(self, key: Hashable, data: bytes) -> None:
+        """
+        Buffer an event without ever blocking on the consumer.
+
+        Args:
+            key: Events with equal keys coalesce
+            data: Encoded event
+        """
+        with self._ready:
+            if key in self._pending:
+                self._pending[key] = data
+                self.coalesced += 1
+            else:
+                if len(self._pending) >= self.max_pending:
+                    self._pending.popitem(last=False)
+                    self.dropped += 1
+                self._pending[key] = data
+            self._ready.notify()
+
+    def take(self, timeout: float) -> List[bytes]:
+        """
+        Wait for events and take all of them.
+
+        Args:
+            timeout: Seconds to wait for the first event
+
+        Returns:
+            Encoded events, oldest first; empty on timeout or once closed
+        """
+        with self._ready:
+            if not self._pending and not self.closed:
+                self._ready.wait(timeout)
+            events = list(self._pending.values())
+            self._pending.clear()
+        return events
+
+    def close(self) -> None:
+        """
+        Wake the consumer and tell it to end the stream.
+        """
+        with self._ready:
+            self.closed = True
+            self._ready.notify_all()
+
+
+class EventBroadcaster:
+    """
+    Publishes events to every subscriber as server-sent event frames.
+
+    An event is encoded once and then only appended to each subscriber's
+    buffer, so publishing costs the checker the same however slow the
+    subscribers are. Nothing is encoded while nobody is subscribed.
+    """
+
+    def __init__(self, max_pending: int = 1000, max_subscribers: int = 20):
+        """
+        Create a broadcaster.
+
+        Args:
+            max_pending: Buffered events per subscriber
+            max_subscribers: Concurrent subscribers allowed
+        """
+        self.max_pending = max_pending
+        self.max_subscribers = max_subscribers
+        self.published = 0
+        self._subscribers: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether anybody is subscribed, so callers can skip building events.
+        """
+        return bool(self._subscribers)
+
+    def subscribe(self) -> Optional[Subscription]:
+        """
+        Add a subscriber.
+
+        Returns:
+            The new Subscription, or None if max_subscribers are connected
+        """
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            subscription = Subscription(self.max_pending)
+            self._subscribers = self._subscribers + [subscription]
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Remove a subscriber.
+
+        Args:
+            subscription: Subscription returned by subscribe()
+        """
+        with self._lock:
+            self._subscribers = [sub for sub in self._subscribers if sub is not subscription]
+
+    def publish(self, key: Hashable, event_type: str, payload: Dict) -> None:
+        """
+        Send an event to every subscriber.
+
+        Args:
+            key: Coalescing key, e.g. the check ID
+            event_type: SSE event name
+            payload: JSON-serializable event data
+        """
+        subscribers = self._subscribers  # Replaced, never mutated, so no lock is needed to read it
+        if not subscribers:
+            return
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        data = f"id: {seq}\nevent: {event_type}\ndata: {json.dumps(payload, default=str)}\n\n".encode('utf-8')
+        for subscription in subscribers:
+            subscription.push(key, data)
+        self.published += 1
+
+    def close(self) -> None:
+        """
+        End every stream, e.g. on shutdown.
+        """
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, []
+        for subscription in subscribers:
+            subscription.close()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get broadcaster counters.
+
+        Returns:
+            Dictionary with subscriber, published, dropped and coalesced counts
+        """
+        subscribers = self._subscribers
+        return {
+            'subscribers': len(subscribers),
+            'published': self.published,
+            'dropped': sum(sub.dropped for sub in subscribers),
+            'coalesced': sum(sub.coalesced for sub in subscribers)
+        }
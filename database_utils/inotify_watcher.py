@@ -0,0 +1,161 @@
+"""
+File change notifications for SQLite databases using Linux inotify.
+Lets the checker react to schema changes instead of polling database files.
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, Set
+
+logger = logging.getLogger(__name__)
+
+IN_MODIFY = 0x00000002
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+# No IN_CLOSE_WRITE: SQLite opens files read-write, so our own checks would trigger it
+WATCH_MASK = IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+# Companion files whose changes can carry a schema change of the database
+SQLITE_SUFFIXES = ('', '-wal', '-journal')
+
+
+def inotify_available() -> bool:
+    """
+    Check whether the platform's C library provides inotify.
+
+    Returns:
+        bool: True if InotifyWatcher can be used
+    """
+    libc_name = ctypes.util.find_library('c')
+    if not libc_name:
+        return False
+    return hasattr(ctypes.CDLL(libc_name), 'inotify_init1')
+
+
+class InotifyWatcher:
+    """
+    Watches SQLite database files and reports them after they changed.
+
+    The directory of each database is watched, so replacing a file by rename
+    and creating or removing its -wal and -journal companions are seen as
+    well. Bursts of events for the same database are debounced: the callback
+    fires once the file has been quiet for debounce seconds.
+    """
+
+    def __init__(self, callback: Callable[[List[str]], None], debounce: float = 0.5):
+        """
+        Create a watcher, call start() to begin watching.
+
+        Args:
+            callback: Called on the watcher thread with the changed database paths
+            debounce: Seconds without events before a database is reported
+        """
+        self.callback = callback
+        self.debounce = debounce
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = -1
+        self._dirs: Dict[int, str] = {}
+        self._files: Dict[str, str] = {}  # Watched file name (incl. companions) -> database path
+        self._pending: Dict[str, float] = {}
+        self._thread = None
+        self._stop_r, self._stop_w = -1, -1
+
+    def start(self, db_paths: List[str]) -> None:
+        """
+        Start watching the given databases on a background thread.
+
+        Args:
+            db_paths: Paths of the SQLite database files
+        """
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        watched_dirs: Set[str] = set()
+        for db_path in db_paths:
+            db_path = os.path.abspath(db_path)
+            directory = os.path.dirname(db_path)
+            for suffix in SQLITE_SUFFIXES:
+                self._files[db_path + suffix] = db_path
+            if directory in watched_dirs:
+                continue
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                logger.error(f"Cannot watch {directory}: {os.strerror(ctypes.get_errno())}")
+                continue
+            self._dirs[wd] = directory
+            watched_dirs.add(directory)
+
+        self._stop_r, self._stop_w = os.pipe()
+        self._thread = threading.Thread(target=self._run, name='sqlite-watcher', daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {len(db_paths)} SQLite databases in {len(watched_dirs)} directories")
+
+    def stop(self) -> None:
+        """
+        Stop watching and release the inotify descriptor.
+        """
+        if self._thread is None:
+            return
+        os.write(self._stop_w, b'x')
+        self._thread.join(timeout=5)
+        self._thread = None
+        for fd in (self._fd, self._stop_r, self._stop_w):
+            os.close(fd)
+        self._fd = self._stop_r = self._stop_w = -1
+        self._dirs.clear()
+        self._files.clear()
+        self._pending.clear()
+
+    def _run(self) -> None:
+        while True:
+            timeout = None
+            if self._pending:
+                timeout = max(0.0, min(self._pending.values()) + self.debounce - time.monotonic())
+
+            readable, _, _ = select.select([self._fd, self._stop_r], [], [], timeout)
+            if self._stop_r in readable:
+                return
+            if self._fd in readable:
+                self._read_events()
+
+            now = time.monotonic()
+            ready = [path for path, last in self._pending.items() if now - last >= self.debounce]
+            for path in ready:
+                del self._pending[path]
+            if ready:
+                try:
+                    self.callback(ready)
+                except Exception as e:
+                    logger.error(f"Error handling SQLite change notification: {e}")
+
+    def _read_events(self) -> None:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        now = time.monotonic()
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + name_len].rstrip(b'\0')
+            offset += EVENT_HEADER.size + name_len
+
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            db_path = self._files.get(os.path.join(directory, os.fsdecode(name)))
+            if db_path is not None:
+                self._pending[db_path] = now
@@ -0,0 +1,288 @@
+"""
+Prometheus metrics.
+Keeps the checker's counters, gauges and histograms in flat arrays that are allocated when
+checks are loaded, and renders them in the Prometheus text exposition format.
+"""
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .check_state import STATUSES, STATUS_CODES
+
+# Upper bounds in seconds, shared by all latency histograms
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (metric name, type, help, [(label string, value)])
+MetricFamily = Tuple[str, str, str, List[Tuple[str, float]]]
+
+
+def format_labels(labels: Dict[str, str]) -> str:
+    """
+    Render a label set for the text exposition format.
+
+    Args:
+        labels: Label names mapped to values
+
+    Returns:
+        Labels like 'a="1",b="2"', values escaped
+    """
+    return ','.join(
+        f'{name}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in labels.items()
+    )
+
+
+def _with_label(labels: str, extra: str) -> str:
+    return f'{labels},{extra}' if labels else extra
+
+
+class HistogramArray:
+    """
+    Histograms for many label sets, one slot each, in flat typed arrays.
+
+    Observing a value is a bisect and three array updates; bucket counts
+    are stored per bucket and only made cumulative when rendered.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, size: int = 0):
+        """
+        Create histograms.
+
+        Args:
+            buckets: Sorted bucket upper bounds, +Inf is implied
+            size: Number of slots to allocate
+        """
+        self.buckets = tuple(buckets)
+        self.counts = array('Q')
+        self.sums = array('d')
+        self.resize(size)
+
+    def __len__(self) -> int:
+        return len(self.sums)
+
+    def resize(self, size: int) -> None:
+        """
+        Grow to hold slots 0 to size - 1; histograms never shrink.
+
+        Args:
+            size: Number of slots
+        """
+        grow = size - len(self.sums)
+        if grow > 0:
+            self.counts.extend([0] * (grow * (len(self.buckets) + 1)))
+            self.sums.extend([0.0] * grow)
+
+    def observe(self, slot: int, value: float) -> None:
+        """
+        Record one value.
+
+        Args:
+            slot: Histogram slot
+            value: Observed value in seconds
+        """
+        self.counts[slot * (len(self.buckets) + 1) + bisect_left(self.buckets, value)] += 1
+        self.sums[slot] += value
+
+    def samples(self, name: str, slot: int, labels: str) -> List[Tuple[str, float]]:
+        """
+        Get the exposition samples of one slot.
+
+        Args:
+            name: Metric name
+            slot: Histogram slot
+            labels: Rendered labels of the slot
+
+        Returns:
+            List of (sample with name and labels, value)
+        """
+        width = len(self.buckets) + 1
+        counts = self.counts[slot * width:(slot + 1) * width]
+        samples = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            total += count
+            le = 'le="+Inf"' if bound == float('inf') else f'le="{bound!r}"'
+            samples.append((f'{name}_bucket{{{_with_label(labels, le)}}}', total))
+        suffix = f'{{{labels}}}' if labels else ''
+        samples.append((f'{name}_sum{suffix}', self.sums[slot]))
+        samples.append((f'{name}_count{suffix}', total))
+        return samples
+
+
+class CheckMetrics:
+    """
+    Metrics of all checks, their databases and the alert path.
+
+    Label strings are rendered once when a check is added, and every value
+    lives in a typed array indexed by check ID or endpoint slot, so
+    recording a result is a few array updates with no label formatting and
+    no locking. Rendering reads the arrays as they are.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Create empty metrics.
+
+        Args:
+            buckets: Bucket upper bounds of the latency histograms in seconds
+        """
+        self.check_labels: List[Optional[str]] = []
+        self.check_endpoint = array('i')
+        self.table_present = array('b')  # 1 present, 0 missing, -1 not known yet
+        self.results = array('Q')  # check_id * len(STATUSES) + status code
+        self.endpoint_labels: List[str] = []
+        self.endpoint_slots: Dict[Hashable, int] = {}
+        self.probe_seconds = HistogramArray(buckets)
+        self.cycle_seconds = HistogramArray(buckets, size=1)
+        self.smtp_seconds = HistogramArray(buckets, size=1)
+        self.smtp_errors = 0
+        self.alerts_raised = 0
+        self.alerts_suppressed = 0
+        self._lock = threading.Lock()  # Only guards adding checks and endpoints
+
+    def resize(self, size: int) -> None:
+        """
+        Grow the per-check arrays to hold check IDs 0 to size - 1.
+
+        Args:
+            size: Number of check IDs
+        """
+        grow = size - len(self.check_labels)
+        if grow <= 0:
+            return
+        self.check_labels.extend([None] * grow)
+        self.check_endpoint.extend([-1] * grow)
+        self.table_present.extend([-1] * grow)
+        self.results.extend([0] * (grow * len(STATUSES)))
+
+    def add_check(self, check_id: int, labels: Dict[str, str], endpoint: Hashable,
+                  endpoint_labels: Dict[str, str]) -> None:
+        """
+        Allocate the metrics of a check and of its database if it is new.
+
+        Args:
+            check_id: Check ID
+            labels: Labels of the check's series
+            endpoint: Key of the check's database
+            endpoint_labels: Labels of the database's series, used the first time it is seen
+        """
+        with self._lock:
+            self.resize(check_id + 1)
+            slot = self.endpoint_slots.get(endpoint)
+            if slot is None:
+                slot = self.endpoint_slots[endpoint] = len(self.endpoint_labels)
+                self.endpoint_labels.append(format_labels(endpoint_labels))
+                self.probe_seconds.resize(slot + 1)
+            self.check_labels[check_id] = format_labels(labels)
+            self.check_endpoint[check_id] = slot
+
+    def remove_check(self, check_id: int) -> None:
+        """
+        Stop exposing a check's series and reset them, so the check ID can be given to another check.
+
+        Args:
+            check_id: Check ID
+        """
+        self.check_labels[check_id] = None
+        self.check_endpoint[check_id] = -1
+        self.table_present[check_id] = -1
+        base = check_id * len(STATUSES)
+        for index in range(base, base + len(STATUSES)):
+            self.results[index] = 0
+
+    def record_result(self, check_id: int, status: str) -> None:
+        """
+        Count a check result and update the table-present gauge.
+
+        Args:
+            check_id: Check ID
+            status: One of STATUSES
+        """
+        self.results[check_id * len(STATUSES) + STATUS_CODES[status]] += 1
+        if status == 'ok':
+            self.table_present[check_id] = 1
+        elif status == 'missing':
+            self.table_present[check_id] = 0
+
+    def observe_probe(self, check_id: int, seconds: float) -> None:
+        """
+        Record the latency of a lookup against the database of a check.
+
+        Args:
+            check_id: Any check of the probed database
+            seconds: Lookup duration
+        """
+        self.probe_seconds.observe(self.check_endpoint[check_id], seconds)
+
+    def observe_cycle(self, seconds: float) -> None:
+        """
+        Record the duration of a check cycle.
+
+        Args:
+            seconds: Cycle duration
+        """
+        self.cycle_seconds.observe(0, seconds)
+
+    def observe_smtp(self, ok: bool, seconds: float) -> None:
+        """
+        Record one SMTP delivery attempt, passed as AlertSender observer.
+
+        Args:
+            ok: Whether the message was delivered
+            seconds: Time spent delivering
+        """
+        self.smtp_seconds.observe(0, seconds)
+        if not ok:
+            self.smtp_errors += 1
+
+    def render(self, extra: Iterable[MetricFamily] = ()) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Args:
+            extra: Additional metric families computed by the caller, e.g. pool sizes
+
+        Returns:
+            Exposition text
+        """
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: Iterable[Tuple[str, float]]) -> None:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(f'{sample} {_format_value(value)}' for sample, value in samples)
+
+        checks = [(check_id, labels) for check_id, labels in enumerate(self.check_labels) if labels is not None]
+        result_labels = [(code, f'result="{status}"') for code, status in enumerate(STATUSES) if code]
+        family('db_checker_table_present', 'gauge', 'Whether the checked table exists (1) or not (0)',
+               ((f'db_checker_table_present{{{labels}}}', self.table_present[check_id])
+                for check_id, labels in checks if self.table_present[check_id] >= 0))
+        family('db_checker_check_results_total', 'counter', 'Check results by outcome',
+               ((f'db_checker_check_results_total{{{_with_label(labels, result)}}}',
+                 self.results[check_id * len(STATUSES) + code])
+                for check_id, labels in checks for code, result in result_labels))
+        family('db_checker_probe_duration_seconds', 'histogram', 'Duration of batched table lookups per database',
+               (sample for slot, labels in enumerate(self.endpoint_labels)
+                for sample in self.probe_seconds.samples('db_checker_probe_duration_seconds', slot, labels)))
+        family('db_checker_cycle_duration_seconds', 'histogram', 'Duration of check cycles',
+               self.cycle_seconds.samples('db_checker_cycle_duration_seconds', 0, ''))
+        family('db_checker_alerts_total', 'counter', 'Alerts raised for failed checks',
+               [('db_checker_alerts_total', self.alerts_raised)])
+        family('db_checker_alerts_suppressed_total', 'counter', 'Alerts suppressed by the cooldown',
+               [('db_checker_alerts_suppressed_total', self.alerts_suppressed)])
+        family('db_checker_smtp_duration_seconds', 'histogram', 'Duration of SMTP deliveries',
+               self.smtp_seconds.samples('db_checker_smtp_duration_seconds', 0, ''))
+        family('db_checker_smtp_errors_total', 'counter', 'Failed SMTP deliveries',
+               [('db_checker_smtp_errors_total', self.smtp_errors)])
+        for name, kind, help_text, samples in extra:
+            family(name, kind, help_text,
+                   ((f'{name}{{{labels}}}' if labels else name, value) for labels, value in samples))
+        lines.append('')
+        return '\n'.join(lines)
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
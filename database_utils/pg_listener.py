@@ -0,0 +1,256 @@
+"""
+Schema change notifications for PostgreSQL databases.
+Holds one LISTEN connection per database and reports databases whose DDL event trigger fired.
+"""
+import logging
+import os
+import re
+import select
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import psycopg2
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHANNEL = 'db_table_checker_ddl'
+
+# Event trigger that notifies listeners after every DDL command and every drop.
+# Event triggers are per database, so this has to be installed in each one.
+# The {channel} placeholder is filled with a validated identifier.
+DDL_TRIGGER_INSTALL_SQL = """
+    CREATE OR REPLACE FUNCTION public.{channel}_notify() RETURNS event_trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        PERFORM pg_notify('{channel}', tg_event || ':' || tg_tag);
+    END
+    $$;
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_event_trigger WHERE evtname = '{channel}_ddl_end') THEN
+            CREATE EVENT TRIGGER {channel}_ddl_end ON ddl_command_end
+                EXECUTE PROCEDURE public.{channel}_notify();
+        END IF;
+        IF NOT EXISTS (SELECT 1 FROM pg_event_trigger WHERE evtname = '{channel}_sql_drop') THEN
+            CREATE EVENT TRIGGER {channel}_sql_drop ON sql_drop
+                EXECUTE PROCEDURE public.{channel}_notify();
+        END IF;
+    END
+    $$;
+"""
+
+
+class PostgresListener:
+    """
+    Listens for DDL notifications on one connection per PostgreSQL database.
+
+    All connections are served by a single background thread. A database is
+    reported through the callback whenever a notification arrives on its
+    channel, and also after its LISTEN connection was re-established, since
+    notifications sent while it was down are lost. Lost connections are
+    retried every reconnect_delay seconds. Databases can be added and removed
+    while listening; the changes are applied on the listener thread.
+    """
+
+    def __init__(self, callback: Callable[[Hashable], None], channel: str = DEFAULT_CHANNEL,
+                 install: bool = False, reconnect_delay: float = 30):
+        """
+        Create a listener, call start() to begin listening.
+
+        Args:
+            callback: Called on the listener thread with the key of a changed database
+            channel: Notification channel, must be a plain SQL identifier
+            install: Create the DDL event trigger in each database if it is missing
+                (requires superuser); otherwise it is expected to be installed
+            reconnect_delay: Seconds between reconnect attempts
+
+        Raises:
+            ValueError: If channel is not a plain SQL identifier
+        """
+        if not re.fullmatch(r'[a-z_][a-z0-9_]{0,40}', channel):
+            raise ValueError(f"Invalid notification channel '{channel}', use lowercase letters, digits and _")
+        self.callback = callback
+        self.channel = channel
+        self.install = install
+        self.reconnect_delay = reconnect_delay
+        self._endpoints: Dict[Hashable, Dict] = {}
+        self._labels: Dict[Hashable, str] = {}
+        self._conns: Dict[Hashable, psycopg2.extensions.connection] = {}
+        self._retry_at: Dict[Hashable, float] = {}
+        self._listened: Set[Hashable] = set()
+        self._changes: List[Tuple[Hashable, Optional[str], Optional[Dict]]] = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+        self._wake_r, self._wake_w = -1, -1
+        self.notifications = 0
+
+    def add(self, key: Hashable, label: str, **connect_args) -> None:
+        """
+        Register a database to listen on, replacing an earlier registration under the same key.
+
+        Args:
+            key: Key reported to the callback for this database
+            label: Description of the database for log messages
+            **connect_args: Keyword arguments for psycopg2.connect
+        """
+        self._submit(key, label, connect_args)
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Stop listening on a database and close its LISTEN connection.
+
+        Args:
+            key: Key the database was added with
+        """
+        self._submit(key, None, None)
+
+    def start(self) -> None:
+        """
+        Connect to every registered database and start listening on a background thread.
+        """
+        self._apply_changes()
+        now = time.monotonic()
+        for key in self._endpoints:
+            self._retry_at[key] = now
+        self._stopping = False
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread = threading.Thread(target=self._run, name='postgres-listener', daemon=True)
+        self._thread.start()
+        logger.info(f"Listening for DDL notifications from {len(self._endpoints)} PostgreSQL databases")
+
+    def stop(self) -> None:
+        """
+        Stop listening and close all LISTEN connections.
+        """
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._wakeup()
+        self._thread.join(timeout=5)
+        self._thread = None
+        with self._lock:
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._wake_r = self._wake_w = -1
+        for conn in self._conns.values():
+            conn.close()
+        self._conns.clear()
+        self._retry_at.clear()
+        self._listened.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get listener counters.
+
+        Returns:
+            Dictionary with database, connected and notification counts
+        """
+        return {
+            'databases': len(self._endpoints),
+            'connected': len(self._conns),
+            'notifications': self.notifications
+        }
+
+    def _run(self) -> None:
+        while True:
+            now = time.monotonic()
+            for key, retry_at in list(self._retry_at.items()):
+                if retry_at <= now:
+                    self._connect(key)
+
+            timeout = None
+            if self._retry_at:
+                timeout = max(0.0, min(self._retry_at.values()) - time.monotonic())
+            by_fd = {conn.fileno(): key for key, conn in self._conns.items()}
+            readable, _, _ = select.select([self._wake_r, *by_fd], [], [], timeout)
+            if self._wake_r in readable:
+                os.read(self._wake_r, 4096)
+                if self._stopping:
+                    return
+                self._apply_changes()
+            for fd in readable:
+                if fd in by_fd and by_fd[fd] in self._conns:
+                    self._poll(by_fd[fd])
+
+    def _submit(self, key: Hashable, label: Optional[str], connect_args: Optional[Dict]) -> None:
+        with self._lock:
+            self._changes.append((key, label, connect_args))
+        self._wakeup()
+
+    def _wakeup(self) -> None:
+        with self._lock:
+            if self._wake_w >= 0:
+                os.write(self._wake_w, b'x')
+
+    def _apply_changes(self) -> None:
+        with self._lock:
+            changes, self._changes = self._changes, []
+        now = time.monotonic()
+        for key, label, connect_args in changes:
+            conn = self._conns.pop(key, None)
+            if conn is not None:
+                conn.close()
+            self._retry_at.pop(key, None)
+            self._listened.discard(key)
+            if connect_args is None:
+                self._endpoints.pop(key, None)
+                self._labels.pop(key, None)
+                continue
+            self._endpoints[key] = connect_args
+            self._labels[key] = label
+            if self._thread is not None:
+                self._retry_at[key] = now
+
+    def _connect(self, key: Hashable) -> None:
+        conn = None
+        try:
+            conn = psycopg2.connect(**self._endpoints[key])
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                if self.install:
+                    self._install_trigger(key, cursor)
+                cursor.execute(f"LISTEN {self.channel}")
+        except psycopg2.Error as e:
+            logger.warning(f"Cannot listen for DDL notifications on {self._labels[key]}: {e}")
+            if conn is not None:
+                conn.close()  # Connected but LISTEN failed, do not leak a server connection per retry
+            self._retry_at[key] = time.monotonic() + self.reconnect_delay
+            return
+
+        del self._retry_at[key]
+        self._conns[key] = conn
+        if key in self._listened:
+            self._notify(key)  # Changes made while the connection was down were not notified
+        self._listened.add(key)
+
+    def _install_trigger(self, key: Hashable, cursor) -> None:
+        try:
+            cursor.execute(DDL_TRIGGER_INSTALL_SQL.format(channel=self.channel))
+        except psycopg2.Error as e:
+            logger.warning(f"Cannot install DDL event trigger on {self._labels[key]}, "
+                           f"notifications need it to be installed manually: {e}")
+
+    def _poll(self, key: Hashable) -> None:
+        conn = self._conns[key]
+        try:
+            conn.poll()
+        except psycopg2.Error as e:
+            logger.warning(f"Lost DDL notification connection to {self._labels[key]}: {e}")
+            del self._conns[key]
+            conn.close()
+            self._retry_at[key] = time.monotonic() + self.reconnect_delay
+            return
+
+        if conn.notifies:
+            self.notifications += len(conn.notifies)
+            conn.notifies.clear()
+            self._notify(key)
+
+    def _notify(self, key: Hashable) -> None:
+        try:
+            self.callback(key)
+        except Exception as e:
+            logger.error(f"Error handling DDL notification from {self._labels[key]}: {e}")
@@ -0,0 +1,170 @@
+"""
+Connection pooling utilities.
+Keeps idle database connections per endpoint so repeated checks can reuse them.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of idle connections keyed by endpoint.
+
+    Connections are handed out with take() and returned with put(). Idle
+    connections older than max_idle seconds are closed instead of reused, and
+    a connection that fails the validate callback is discarded so the caller
+    opens a fresh one.
+    """
+
+    def __init__(self, validate: Callable[[Any], bool], close: Callable[[Any], None],
+                 max_idle: float = 600, max_size: int = 4):
+        """
+        Create an empty pool.
+
+        Args:
+            validate: Returns True if an idle connection is still usable
+            close: Closes a connection that leaves the pool
+            max_idle: Seconds a connection may sit idle before it is evicted
+            max_size: Maximum idle connections kept per endpoint
+        """
+        self.validate = validate
+        self.close = close
+        self.max_idle = max_idle
+        self.max_size = max_size
+        self._idle: Dict[Hashable, List[Tuple[Any, float]]] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def take(self, key: Hashable) -> Optional[Any]:
+        """
+        Take an idle, validated connection for an endpoint.
+
+        Args:
+            key: Endpoint key, e.g. (host, port, database, user)
+
+        Returns:
+            A connection ready for use, or None if the caller must connect
+        """
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                if not idle:
+                    return None
+                conn, released_at = idle.pop()
+
+            if now - released_at > self.max_idle or not self._is_valid(conn):
+                self.discard(conn)
+                continue
+
+            with self._lock:
+                self.reused += 1
+            return conn
+
+    def put(self, key: Hashable, conn: Any) -> None:
+        """
+        Return a healthy connection to the pool.
+
+        Args:
+            key: Endpoint key the connection belongs to
+            conn: Connection to keep for reuse
+        """
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_size:
+                idle.append((conn, time.monotonic()))
+                return
+        self.discard(conn)
+
+    def opened(self) -> None:
+        """
+        Record that the caller opened a new connection for the pool.
+        """
+        with self._lock:
+            self.created += 1
+
+    def discard(self, conn: Any) -> None:
+        """
+        Close a connection that must not be reused.
+
+        Args:
+            conn: Connection to close
+        """
+        with self._lock:
+            self.discarded += 1
+        try:
+            self.close(conn)
+        except Exception:
+            pass
+
+    def evict_idle(self) -> int:
+        """
+        Close connections that have been idle longer than max_idle.
+
+        Returns:
+            Number of connections closed
+        """
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for key, idle in list(self._idle.items()):
+                keep = [(conn, t) for conn, t in idle if now - t <= self.max_idle]
+                expired.extend(conn for conn, t in idle if now - t > self.max_idle)
+                if keep:
+                    self._idle[key] = keep
+                else:
+                    del self._idle[key]
+        for conn in expired:
+            self.discard(conn)
+        return len(expired)
+
+    def close_endpoint(self, key: Hashable) -> int:
+        """
+        Close the idle connections of one endpoint.
+
+        Args:
+            key: Endpoint key
+
+        Returns:
+            Number of connections closed
+        """
+        with self._lock:
+            idle = self._idle.pop(key, [])
+        for conn, _ in idle:
+            self.discard(conn)
+        return len(idle)
+
+    def close_all(self) -> None:
+        """
+        Close every idle connection in the pool.
+        """
+        with self._lock:
+            idle = [conn for conns in self._idle.values() for conn, _ in conns]
+            self._idle.clear()
+        for conn in idle:
+            self.discard(conn)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get pool counters.
+
+        Returns:
+            Dictionary with endpoint, idle, created, reused and discarded counts
+        """
+        with self._lock:
+            return {
+                'endpoints': len(self._idle),
+                'idle': sum(len(idle) for idle in self._idle.values()),
+                'created': self.created,
+                'reused': self.reused,
+                'discarded': self.discarded
+            }
+
+    def _is_valid(self, conn: Any) -> bool:
+        try:
+            return bool(self.validate(conn))
+        except Exception:
+            return False
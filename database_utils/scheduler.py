@@ -0,0 +1,184 @@
+"""
+Scheduling utilities for periodic checks.
+Keeps per-check run times in a heap so each check can have its own interval.
+"""
+import heapq
+import math
+import random
+import threading
+import time
+from typing import Dict, Hashable, Iterable, List, Optional
+
+
+class CheckScheduler:
+    """
+    Heap-based scheduler for items that run at individual intervals.
+
+    Each item owns a slot on its own time grid (start + k * interval), so the
+    schedule never drifts no matter how long a run takes; missed slots are
+    skipped instead of run back to back. A random jitter of up to
+    jitter * interval is added to every run so items that share an interval
+    do not hit their databases in the same instant.
+
+    Items added with the same group share one grid and one jitter per slot,
+    so they always become due together and are popped in the same batch,
+    e.g. every check against one database at one interval.
+    """
+
+    def __init__(self, jitter: float = 0.1):
+        """
+        Create an empty scheduler.
+
+        Args:
+            jitter: Maximum random delay per run as a fraction of the interval
+        """
+        self.jitter = jitter
+        self._heap = []
+        self._intervals: Dict[Hashable, float] = {}
+        self._slots: Dict[Hashable, float] = {}
+        self._entries: Dict[Hashable, int] = {}
+        self._groups: Dict[Hashable, Hashable] = {}
+        self._group_slots: Dict[Hashable, float] = {}  # A slot on each group's grid
+        self._group_sizes: Dict[Hashable, int] = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def add(self, item: Hashable, interval: float, first_slot: Optional[float] = None,
+            group: Optional[Hashable] = None) -> None:
+        """
+        Schedule an item, replacing any existing schedule for it.
+
+        Args:
+            item: Item identifier, e.g. a check ID
+            interval: Seconds between runs
+            first_slot: Monotonic time of the first run; by default the next
+                slot of the item's group, or a random point within the first
+                interval for a new group, spreading groups evenly
+            group: Items of one group run together, must share the interval;
+                by default each item is its own group
+        """
+        now = time.monotonic()
+        group = item if group is None else group
+        with self._lock:
+            self._forget(item)
+            if first_slot is None:
+                first_slot = self._group_slots.get(group)
+                if first_slot is None:
+                    first_slot = now + random.uniform(0, interval)
+                elif first_slot < now:
+                    # Join the group's grid at its upcoming slot
+                    first_slot += math.ceil((now - first_slot) / interval) * interval
+            self._intervals[item] = interval
+            self._slots[item] = first_slot
+            self._groups[item] = group
+            self._group_sizes[group] = self._group_sizes.get(group, 0) + 1
+            self._group_slots.setdefault(group, first_slot)
+            self._push(item, self._jittered(item, first_slot))
+
+    def remove(self, item: Hashable) -> None:
+        """
+        Stop scheduling an item.
+
+        Args:
+            item: Item identifier
+        """
+        with self._lock:
+            self._forget(item)
+
+    def clear(self) -> None:
+        """
+        Remove every scheduled item.
+        """
+        with self._lock:
+            self._heap = []
+            self._intervals.clear()
+            self._slots.clear()
+            self._entries.clear()
+            self._groups.clear()
+            self._group_slots.clear()
+            self._group_sizes.clear()
+
+    def pop_due(self, now: Optional[float] = None) -> List[Hashable]:
+        """
+        Take every item that is due and schedule its next run.
+
+        Args:
+            now: Monotonic time to compare against, defaults to the current time
+
+        Returns:
+            List of due item identifiers
+        """
+        if now is None:
+            now = time.monotonic()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, seq, item = heapq.heappop(self._heap)
+                if self._entries.get(item) != seq:
+                    continue  # Removed or rescheduled since this entry was pushed
+                due.append(item)
+
+                interval = self._intervals[item]
+                slot = self._slots[item]
+                if slot <= now:
+                    slot += interval
+                    if slot <= now:
+                        # Skip the slots we missed and stay on the original grid
+                        slot += math.ceil((now - slot) / interval) * interval
+                # Otherwise this was an early run from run_now(), keep the upcoming slot
+                self._slots[item] = slot
+                self._group_slots[self._groups[item]] = slot
+                self._push(item, self._jittered(item, slot))
+        return due
+
+    def run_now(self, items: Optional[Iterable[Hashable]] = None) -> None:
+        """
+        Make items due immediately without moving their regular schedule.
+
+        Args:
+            items: Item identifiers, all scheduled items if None
+        """
+        now = time.monotonic()
+        with self._lock:
+            for item in list(self._intervals) if items is None else items:
+                if item in self._intervals:
+                    self._push(item, now)
+
+    def next_due(self) -> Optional[float]:
+        """
+        Get the monotonic time at which the next item becomes due.
+
+        Returns:
+            Monotonic time, or None if nothing is scheduled
+        """
+        with self._lock:
+            while self._heap and self._entries.get(self._heap[0][2]) != self._heap[0][1]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _jittered(self, item: Hashable, slot: float) -> float:
+        if self.jitter <= 0:
+            return slot
+        # Seeded by group and slot, so every item of a group gets the same jitter for a slot
+        jitter = random.Random(hash((self._groups[item], slot))).uniform(0, self.jitter * self._intervals[item])
+        return slot + jitter
+
+    def _forget(self, item: Hashable) -> None:
+        self._intervals.pop(item, None)
+        self._slots.pop(item, None)
+        self._entries.pop(item, None)
+        group = self._groups.pop(item, None)
+        if group is None:
+            return
+        self._group_sizes[group] -= 1
+        if not self._group_sizes[group]:
+            del self._group_sizes[group]
+            del self._group_slots[group]
+
+    def _push(self, item: Hashable, fire_at: float) -> None:
+        self._seq += 1
+        self._entries[item] = self._seq
+        heapq.heappush(self._heap, (fire_at, self._seq, item))
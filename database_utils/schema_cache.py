@@ -0,0 +1,89 @@
+"""
+Schema snapshot cache.
+Remembers the table names of each database together with a cheap fingerprint,
+so the full table list only has to be fetched again when the schema changes.
+"""
+import threading
+from typing import Dict, FrozenSet, Hashable, NamedTuple, Optional
+
+
+class SchemaSnapshot(NamedTuple):
+    """
+    Table names of one database and the fingerprint they were read at.
+    """
+    fingerprint: object
+    tables: FrozenSet[str]
+
+
+class SchemaCache:
+    """
+    Thread-safe cache of schema snapshots keyed by database endpoint.
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[Hashable, SchemaSnapshot] = {}
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self.reuses = 0
+
+    def get(self, key: Hashable) -> Optional[SchemaSnapshot]:
+        """
+        Get the cached snapshot of a database.
+
+        Args:
+            key: Endpoint key
+
+        Returns:
+            SchemaSnapshot, or None if the database has not been read yet
+        """
+        with self._lock:
+            return self._snapshots.get(key)
+
+    def put(self, key: Hashable, fingerprint: object, tables: FrozenSet[str]) -> SchemaSnapshot:
+        """
+        Store a freshly read snapshot.
+
+        Args:
+            key: Endpoint key
+            fingerprint: Value that changes whenever the table list changes
+            tables: Table names read at that fingerprint
+
+        Returns:
+            The stored SchemaSnapshot
+        """
+        snapshot = SchemaSnapshot(fingerprint, frozenset(tables))
+        with self._lock:
+            self._snapshots[key] = snapshot
+            self.refreshes += 1
+        return snapshot
+
+    def reused(self) -> None:
+        """
+        Record that a lookup was answered from a cached snapshot.
+        """
+        with self._lock:
+            self.reuses += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drop the snapshot of a database so the next lookup reads it again.
+
+        Args:
+            key: Endpoint key
+        """
+        with self._lock:
+            self._snapshots.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with cached database, refresh and reuse counts
+        """
+        with self._lock:
+            return {
+                'databases': len(self._snapshots),
+                'refreshes': self.refreshes,
+                'reuses': self.reuses
+            }
@@ -0,0 +1,160 @@
+"""
+Durable check state.
+Persists the last result, last alert and failure streak of every check in a local SQLite
+database, so alert cooldowns survive restarts and redeploys, and optionally the history of
+check results.
+"""
+import logging
+import sqlite3
+import threading
+from typing import Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATE_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS check_state (
+        check_key TEXT PRIMARY KEY,
+        last_run REAL NOT NULL DEFAULT 0,
+        last_result TEXT NOT NULL DEFAULT 'unknown',
+        last_alert REAL NOT NULL DEFAULT 0,
+        consecutive_failures INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS check_history (
+        check_key TEXT NOT NULL,
+        at REAL NOT NULL,
+        result TEXT NOT NULL,
+        connect_ms REAL NOT NULL,
+        query_ms REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS check_history_at ON check_history (at);
+    CREATE INDEX IF NOT EXISTS check_history_key_at ON check_history (check_key, at)
+"""
+
+STATE_UPSERT_SQL = """
+    INSERT INTO check_state (check_key, last_run, last_result, last_alert, consecutive_failures)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (check_key) DO UPDATE SET
+        last_run = excluded.last_run,
+        last_result = excluded.last_result,
+        last_alert = excluded.last_alert,
+        consecutive_failures = excluded.consecutive_failures
+"""
+
+STATE_HISTORY_INSERT_SQL = """
+    INSERT INTO check_history (check_key, at, result, connect_ms, query_ms) VALUES (?, ?, ?, ?, ?)
+"""
+
+# State row: (last_run, last_result, last_alert, consecutive_failures)
+StateRow = Tuple[float, str, float, int]
+
+
+class StateStore:
+    """
+    SQLite-backed store of per-check state, keyed by a stable check key.
+
+    The database runs in WAL mode with synchronous=NORMAL, so a batch of
+    changed checks is one short transaction without an fsync on every
+    commit. Check IDs are not stable across restarts, so rows are keyed by a
+    string built from the check's name, table and database instead.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open or create the state database.
+
+        Args:
+            path: Path of the SQLite file
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened or created
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(STATE_SCHEMA_SQL)
+        self.writes = 0
+        self.rows_written = 0
+        self.history_written = 0
+
+    def load(self) -> Dict[str, StateRow]:
+        """
+        Read the state of every stored check in one query.
+
+        Returns:
+            Dictionary mapping check keys to (last_run, last_result, last_alert, consecutive_failures)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT check_key, last_run, last_result, last_alert, consecutive_failures FROM check_state"
+            ).fetchall()
+        return {row[0]: row[1:] for row in rows}
+
+    def save(self, rows: Iterable[Tuple[str, float, str, float, int]],
+             history: Iterable[Tuple[str, float, str, float, float]] = ()) -> int:
+        """
+        Write the state of several checks and new history samples in a single transaction.
+
+        Args:
+            rows: Tuples of (check_key, last_run, last_result, last_alert, consecutive_failures)
+            history: Tuples of (check_key, at, result, connect_ms, query_ms) to append
+
+        Returns:
+            Number of state rows written
+
+        Raises:
+            sqlite3.Error: If the write fails, the transaction is rolled back
+        """
+        rows = list(rows)
+        history = list(history)
+        if not rows and not history:
+            return 0
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(STATE_UPSERT_SQL, rows)
+                self._conn.executemany(STATE_HISTORY_INSERT_SQL, history)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self.writes += 1
+            self.rows_written += len(rows)
+            self.history_written += len(history)
+        return len(rows)
+
+    def prune_history(self, before: float) -> int:
+        """
+        Delete history samples older than a point in time.
+
+        Args:
+            before: Unix time, older samples are deleted
+
+        Returns:
+            Number of samples deleted
+        """
+        with self._lock:
+            return self._conn.execute("DELETE FROM check_history WHERE at < ?", (before,)).rowcount
+
+    def close(self) -> None:
+        """
+        Close the state database.
+        """
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get store counters.
+
+        Returns:
+            Dictionary with write transaction, written state row and history sample counts
+        """
+        with self._lock:
+            return {
+                'writes': self.writes,
+                'rows_written': self.rows_written,
+                'history_written': self.history_written
+            }
@@ -0,0 +1,312 @@
+"""
+Built-in HTTP status server.
+Serves the checker status as JSON and as a small HTML dashboard from a pre-rendered snapshot,
+so requests never wait for or interfere with running checks.
+"""
+import hmac
+import html
+import json
+import logging
+import re
+import threading
+import time
+from datetime import datetime
+from http.cookies import CookieError, SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, NamedTuple, Optional
+from urllib.parse import parse_qs
+
+from .event_stream import EventBroadcaster, Subscription
+
+logger = logging.getLogger(__name__)
+
+# Cookie that keeps a browser signed in after opening the dashboard with ?token=
+TOKEN_COOKIE = 'status_token'
+
+RESULT_COLORS = {
+    'ok': '#2e7d32',
+    'missing': '#c62828',
+    'timeout': '#ef6c00',
+    'circuit_open': '#6a1b9a',
+    'unknown': '#757575'
+}
+
+
+class StatusSnapshot(NamedTuple):
+    """
+    Status rendered once per cycle, served as is to every request.
+    """
+    generated_at: float
+    status_json: bytes
+    checks_json: bytes
+    dashboard_html: bytes
+
+
+def build_snapshot(status: Dict) -> StatusSnapshot:
+    """
+    Render a status dictionary into the bodies served by StatusServer.
+
+    Args:
+        status: Status as returned by DatabaseTableChecker.get_status()
+
+    Returns:
+        StatusSnapshot with JSON and HTML bodies
+    """
+    return StatusSnapshot(
+        generated_at=time.time(),
+        status_json=json.dumps(status, default=str).encode('utf-8'),
+        checks_json=json.dumps(status.get('checks', []), default=str).encode('utf-8'),
+        dashboard_html=render_dashboard(status).encode('utf-8')
+    )
+
+
+def render_dashboard(status: Dict, refresh: int = 30) -> str:
+    """
+    Render the HTML dashboard of a status dictionary.
+
+    Args:
+        status: Status as returned by DatabaseTableChecker.get_status()
+        refresh: Seconds between automatic page reloads
+
+    Returns:
+        HTML document
+    """
+    checks: List[Dict] = status.get('checks', [])
+    counts: Dict[str, int] = {}
+    for check in checks:
+        counts[check['last_result']] = counts.get(check['last_result'], 0) + 1
+
+    def cell(value) -> str:
+        return f"<td>{html.escape('' if value is None else str(value))}</td>"
+
+    rows = []
+    for check in checks:
+        result = check['last_result']
+        latency = check.get('latency') or {}
+        rows.append(
+            "<tr>"
+            + cell(check['id']) + cell(check['name']) + cell(check['type']) + cell(check['table'])
+            + f"<td style=\"color:{RESULT_COLORS.get(result, '#000')};font-weight:bold\">{html.escape(result)}</td>"
+            + cell(check['last_run']) + cell(check['last_alert']) + cell(check.get('consecutive_failures'))
+            + cell(latency.get('last_connect_ms')) + cell(latency.get('last_query_ms'))
+            + cell(latency.get('avg_query_ms'))
+            + "</tr>"
+        )
+
+    summary = ', '.join(f"{count} {html.escape(result)}" for result, count in sorted(counts.items())) or 'no checks'
+    state = 'running' if status.get('is_running') else 'stopped'
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta http-equiv="refresh" content="{refresh}">
+<title>Database Table Checker</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; font-size: 0.9em; }}
+th, td {{ border: 1px solid #ddd; padding: 4px 8px; text-align: left; }}
+th {{ background: #f5f5f5; }}
+</style>
+</head>
+<body>
+<h1>Database Table Checker</h1>
+<p>Monitoring is {state}, engine {html.escape(str(status.get('engine')))}. {len(checks)} checks: {summary}.</p>
+<p>Updated {datetime.now().isoformat(timespec='seconds')}. <a href="/status">status JSON</a> &middot; <a href="/checks">checks JSON</a></p>
+<table>
+<tr><th>ID</th><th>Name</th><th>Type</th><th>Table</th><th>Result</th><th>Last run</th><th>Last alert</th>
+<th>Failures</th><th>Connect ms</th><th>Query ms</th><th>Avg query ms</th></tr>
+{''.join(rows)}
+</table>
+</body>
+</html>
+"""
+
+
+class StatusServer:
+    """
+    Threaded HTTP server for the checker status.
+
+    Routes:
+        /               HTML dashboard
+        /status         Full status JSON
+        /checks         Per-check state and latency JSON
+        /checks/<id>    One check with its result history
+        /metrics        Prometheus metrics, if a metrics callback is given
+        /events         Server-sent event stream of check results, if a broadcaster is given
+        /health         Liveness probe, always 200
+
+    The dashboard and JSON responses come from the snapshot callback, which
+    returns a ready-rendered StatusSnapshot, so such a request costs no more
+    than writing bytes. Check details and metrics are read from the
+    checker's state arrays without taking any lock the checks use.
+
+    With a token, every route but /health answers 401 unless the request
+    carries it as "Authorization: Bearer <token>", as ?token=<token> or in
+    the cookie set by a request that used ?token=, so the dashboard's links
+    and its event stream keep working in a browser.
+    """
+
+    def __init__(self, snapshot: Callable[[], Optional[StatusSnapshot]],
+                 check_detail: Callable[[int], Optional[Dict]],
+                 host: str = '0.0.0.0', port: int = 8080,
+                 metrics: Optional[Callable[[], bytes]] = None,
+                 events: Optional[EventBroadcaster] = None, keepalive: float = 15,
+                 token: Optional[str] = None):
+        """
+        Create a server, call start() to begin serving.
+
+        Args:
+            snapshot: Returns the current snapshot, None before the first one
+            check_detail: Returns one check with its history, None if the ID is unknown
+            host: Interface to bind
+            port: Port to bind
+            metrics: Returns the Prometheus text exposition
+            events: Broadcaster whose events are streamed on /events
+            keepalive: Seconds between keepalive comments on idle streams
+            token: Secret required for every route but /health, None to serve without authentication
+        """
+        self.snapshot = snapshot
+        self.check_detail = check_detail
+        self.metrics = metrics
+        self.events = events
+        self.keepalive = keepalive
+        self.token = token
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._httpd = None
+        self._thread = None
+
+    def start(self) -> None:
+        """
+        Bind the port and serve on a background thread.
+
+        Raises:
+            OSError: If the port cannot be bound
+        """
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='status-server', daemon=True)
+        self._thread.start()
+        logger.info(f"Serving status on http://{self.host}:{self.port}/")
+
+    def stop(self) -> None:
+        """
+        Stop serving and release the port.
+        """
+        if self._httpd is None:
+            return
+        if self.events:
+            self.events.close()  # Ends open streams so their threads exit
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join(timeout=5)
+        self._httpd = None
+        self._thread = None
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            _set_cookie = False  # The request authenticated with ?token=, remember it in a cookie
+
+            def do_GET(self):
+                server.requests += 1
+                path, _, query = self.path.partition('?')
+                path = path.rstrip('/') or '/'
+                if path == '/health':
+                    self._send(200, 'text/plain; charset=utf-8', b'ok\n')
+                    return
+                self._set_cookie = False
+                if server.token is not None and not self._authorized(query):
+                    self._send(401, 'text/plain; charset=utf-8', b'unauthorized\n')
+                    return
+                if path == '/metrics' and server.metrics is not None:
+                    self._send(200, 'text/plain; version=0.0.4; charset=utf-8', server.metrics())
+                    return
+                if path == '/events' and server.events is not None:
+                    self._stream(server.events.subscribe())
+                    return
+
+                match = re.fullmatch(r'/checks/(\d+)', path)
+                if match:
+                    detail = server.check_detail(int(match.group(1)))
+                    if detail is None:
+                        self._send(404, 'application/json', b'{"error": "unknown check"}')
+                    else:
+                        self._send(200, 'application/json', json.dumps(detail, default=str).encode('utf-8'))
+                    return
+
+                snapshot = server.snapshot()
+                if path not in ('/', '/status', '/checks'):
+                    self._send(404, 'text/plain; charset=utf-8', b'not found\n')
+                elif snapshot is None:
+                    self._send(503, 'text/plain; charset=utf-8', b'status not available yet\n')
+                elif path == '/':
+                    self._send(200, 'text/html; charset=utf-8', snapshot.dashboard_html)
+                elif path == '/status':
+                    self._send(200, 'application/json', snapshot.status_json)
+                else:
+                    self._send(200, 'application/json', snapshot.checks_json)
+
+            def _authorized(self, query: str) -> bool:
+                expected = server.token.encode('utf-8')
+                auth = self.headers.get('Authorization', '')
+                if auth.startswith('Bearer ') and hmac.compare_digest(auth[7:].strip().encode('utf-8'), expected):
+                    return True
+                for candidate in parse_qs(query).get('token', []):
+                    if hmac.compare_digest(candidate.encode('utf-8'), expected):
+                        self._set_cookie = True
+                        return True
+                try:
+                    cookie = SimpleCookie(self.headers.get('Cookie', ''))
+                except CookieError:
+                    return False
+                morsel = cookie.get(TOKEN_COOKIE)
+                return morsel is not None and hmac.compare_digest(morsel.value.encode('utf-8'), expected)
+
+            def _send_cookie(self) -> None:
+                if self._set_cookie:
+                    self.send_header('Set-Cookie', f'{TOKEN_COOKIE}={server.token}; Path=/; HttpOnly; SameSite=Strict')
+
+            def _stream(self, subscription: Optional[Subscription]) -> None:
+                if subscription is None:
+                    self._send(503, 'text/plain; charset=utf-8', b'too many subscribers\n')
+                    return
+                try:
+                    # A client that stops reading fails the write instead of holding this thread forever
+                    self.connection.settimeout(max(30.0, server.keepalive * 2))
+                    self.send_response(200)
+                    self._send_cookie()
+                    self.send_header('Content-Type', 'text/event-stream')
+                    self.send_header('Cache-Control', 'no-store')
+                    self.send_header('X-Accel-Buffering', 'no')
+                    self.end_headers()
+                    self.wfile.write(b'retry: 5000\n\n')
+                    self.wfile.flush()
+                    while not subscription.closed:
+                        events = subscription.take(server.keepalive)
+                        self.wfile.write(b''.join(events) if events else b': keepalive\n\n')
+                        self.wfile.flush()
+                except OSError:
+                    pass  # Client went away
+                finally:
+                    server.events.unsubscribe(subscription)
+                    self.close_connection = True
+
+            def _send(self, code: int, content_type: str, body: bytes) -> None:
+                self.send_response(code)
+                if code == 401:
+                    self.send_header('WWW-Authenticate', 'Bearer')
+                else:
+                    self._send_cookie()
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"{self.address_string()} {format % args}")
+
+        return Handler
@@ -0,0 +1,61 @@
+"""
+Tests for streaming JSON array catalogs.
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from database_utils import catalog
+from database_utils.catalog import iter_check_catalog
+
+DOCUMENT = '[{"name": "a", "timeout": 1500.25}, 1500, -2e3, "x,]", true, [1, 2], {"b": null}]'
+ENTRIES = [{"name": "a", "timeout": 1500.25}, 1500, -2e3, "x,]", True, [1, 2], {"b": None}]
+
+
+class JsonArrayCatalogTest(unittest.TestCase):
+    def parse(self, text: str, chunk_size: int) -> list:
+        fd, path = tempfile.mkstemp(suffix='.json')
+        self.addCleanup(os.remove, path)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        with mock.patch.object(catalog, 'CHUNK_SIZE', chunk_size):
+            return [entry for _, entry in iter_check_catalog(path)]
+
+    def assert_rejected_at_every_split(self, text: str) -> None:
+        for chunk_size in range(1, len(text) + 2):
+            with self.subTest(chunk_size=chunk_size):
+                with self.assertRaises(ValueError):
+                    self.parse(text, chunk_size)
+
+    def test_every_chunk_boundary_gives_the_same_entries(self):
+        for chunk_size in range(1, len(DOCUMENT) + 2):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.parse(DOCUMENT, chunk_size), ENTRIES)
+
+    def test_number_cut_at_a_chunk_boundary_is_read_whole(self):
+        self.assertEqual(self.parse('[1500.5]', 6), [1500.5])
+        self.assertEqual(self.parse('[1e10, 15]', 3), [1e10, 15])
+
+    def test_empty_array_and_surrounding_whitespace(self):
+        self.assertEqual(self.parse(' [ ] \n', 2), [])
+        self.assertEqual(self.parse('[1]\n\n', 1), [1])
+
+    def test_missing_comma_is_rejected(self):
+        self.assert_rejected_at_every_split('[{"a": 1} {"b": 2}]')
+        self.assert_rejected_at_every_split('[1 2]')
+
+    def test_trailing_garbage_is_rejected(self):
+        self.assert_rejected_at_every_split('[1, 2] x')
+        self.assert_rejected_at_every_split('[1]]')
+
+    def test_trailing_comma_is_rejected(self):
+        self.assert_rejected_at_every_split('[1, 2,]')
+
+    def test_missing_closing_bracket_is_rejected(self):
+        self.assert_rejected_at_every_split('[1, 2')
+        self.assert_rejected_at_every_split('[1500.')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Tests for AlertSender against a local SMTP stub.
+"""
+import socketserver
+import threading
+import time
+import unittest
+from email.mime.text import MIMEText
+
+from database_utils.email_utils import AlertSender
+
+
+class StubSMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Speaks just enough SMTP for smtplib: no TLS, no AUTH.
+
+    Recipients containing 'refused' are rejected, and the session is closed
+    after a delivered message while the server's drop_next flag is set.
+    """
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.sessions += 1
+        self.reply(220, 'stub ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            command = line.decode('ascii').strip().upper()
+            with server.lock:
+                server.commands.append(command.split(' ', 1)[0])
+            if command.startswith(('EHLO', 'HELO')):
+                self.reply(250, 'stub')
+            elif command.startswith('RCPT TO') and 'REFUSED' in command:
+                self.reply(550, 'no such user')
+            elif command == 'DATA':
+                self.reply(354, 'end with .')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                with server.lock:
+                    server.delivered += 1
+                    drop, server.drop_next = server.drop_next, False
+                self.reply(250, 'queued')
+                if drop:
+                    break
+            elif command == 'QUIT':
+                self.reply(221, 'bye')
+                break
+            else:
+                self.reply(250, 'ok')
+        with server.lock:
+            server.closed += 1
+
+    def reply(self, code: int, text: str) -> None:
+        self.wfile.write(f'{code} {text}\r\n'.encode('ascii'))
+
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubSMTPHandler)
+        self.lock = threading.Lock()
+        self.sessions = 0
+        self.closed = 0
+        self.delivered = 0
+        self.drop_next = False
+        self.commands = []
+
+
+class AlertSenderTest(unittest.TestCase):
+    def setUp(self):
+        self.server = StubSMTPServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def sender(self, idle_timeout: float = 60) -> AlertSender:
+        sender = AlertSender('', '', host='127.0.0.1', port=self.server.server_address[1],
+                             starttls=False, idle_timeout=idle_timeout, timeout=5)
+        self.addCleanup(sender.stop)
+        return sender
+
+    def send(self, sender: AlertSender, to_email: str) -> bool:
+        msg = MIMEText('body')
+        msg['From'] = 'checker@example.com'
+        msg['To'] = to_email
+        msg['Subject'] = 'alert'
+        done = threading.Event()
+        results = []
+        sender.enqueue(msg, lambda ok: (results.append(ok), done.set()))
+        self.assertTrue(done.wait(10))
+        return results[0]
+
+    def wait_for(self, condition) -> None:
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_refused_recipient_keeps_the_session(self):
+        sender = self.sender()
+        self.assertFalse(self.send(sender, 'refused@example.com'))
+        self.assertTrue(self.send(sender, 'ops@example.com'))
+
+        self.assertEqual(self.server.sessions, 1)
+        self.assertIn('RSET', self.server.commands)
+        self.assertEqual(sender.stats()['failed'], 1)
+        self.assertEqual(sender.stats()['sent'], 1)
+
+    def test_dropped_session_is_reopened(self):
+        sender = self.sender()
+        self.server.drop_next = True
+        self.assertTrue(self.send(sender, 'ops@example.com'))
+        self.wait_for(lambda: self.server.closed == 1)
+
+        self.assertTrue(self.send(sender, 'ops@example.com'))
+        self.assertEqual(self.server.sessions, 2)
+        self.assertEqual(self.server.delivered, 2)
+        self.assertEqual(sender.stats()['failed'], 0)
+
+    def test_idle_session_is_closed(self):
+        sender = self.sender(idle_timeout=0.2)
+        self.assertTrue(self.send(sender, 'ops@example.com'))
+        self.wait_for(lambda: self.server.closed == 1)
+
+        self.assertEqual(self.server.commands[-1], 'QUIT')
+        self.assertIsNone(sender._server)
+
+
+if __name__ == '__main__':
+    unittest.main()
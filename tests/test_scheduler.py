@@ -0,0 +1,97 @@
+"""
+Tests for the slot and jitter math of CheckScheduler.
+"""
+import time
+import unittest
+
+from database_utils.scheduler import CheckScheduler
+
+
+class CheckSchedulerTest(unittest.TestCase):
+    def test_missed_slots_are_skipped_on_the_original_grid(self):
+        scheduler = CheckScheduler(jitter=0)
+        start = time.monotonic() + 100
+        scheduler.add('a', 10, first_slot=start)
+
+        self.assertEqual(scheduler.pop_due(start - 1), [])
+        self.assertEqual(scheduler.pop_due(start), ['a'])
+        self.assertEqual(scheduler.next_due(), start + 10)
+
+        # Three slots missed, the next run stays on start + k * 10
+        self.assertEqual(scheduler.pop_due(start + 35), ['a'])
+        self.assertEqual(scheduler.next_due(), start + 40)
+
+    def test_jitter_stays_within_its_fraction_of_the_interval(self):
+        scheduler = CheckScheduler(jitter=0.1)
+        start = time.monotonic() + 100
+        for item in range(50):
+            scheduler.add(item, 20, first_slot=start)
+        fire_times = [fire_at for fire_at, _, _ in scheduler._heap]
+        self.assertTrue(all(start <= fire_at <= start + 2 for fire_at in fire_times))
+
+    def test_default_first_slot_is_within_the_first_interval(self):
+        scheduler = CheckScheduler(jitter=0)
+        before = time.monotonic()
+        scheduler.add('a', 30)
+        self.assertTrue(before <= scheduler.next_due() <= time.monotonic() + 30)
+
+    def test_group_shares_first_slot_and_jitter(self):
+        scheduler = CheckScheduler(jitter=0.5)
+        for item in ('a', 'b', 'c'):
+            scheduler.add(item, 60, group='db1')
+        fire_times = {fire_at for fire_at, _, _ in scheduler._heap}
+        self.assertEqual(len(fire_times), 1)
+
+    def test_group_stays_due_together_across_cycles(self):
+        scheduler = CheckScheduler(jitter=0.5)
+        for item in range(5):
+            scheduler.add(item, 4, group='db1')
+        scheduler.add('other', 4, group='db2')
+
+        now = scheduler.next_due()
+        for _ in range(10):
+            due = scheduler.pop_due(now)
+            group_due = sorted(item for item in due if item != 'other')
+            self.assertIn(group_due, ([], [0, 1, 2, 3, 4]))
+            now = scheduler.next_due()
+
+    def test_groups_get_different_slots(self):
+        scheduler = CheckScheduler(jitter=0.1)
+        for group in range(20):
+            scheduler.add(group, 60, group=f'db{group}')
+        fire_times = {fire_at for fire_at, _, _ in scheduler._heap}
+        self.assertEqual(len(fire_times), 20)
+
+    def test_item_added_later_joins_the_group_grid(self):
+        scheduler = CheckScheduler(jitter=0.2)
+        start = time.monotonic() - 25  # The group's grid started in the past
+        scheduler.add('a', 10, first_slot=start, group='db1')
+        self.assertEqual(scheduler.pop_due(), ['a'])
+
+        scheduler.add('b', 10, group='db1')
+        self.assertEqual(scheduler._slots['b'], scheduler._slots['a'])
+        self.assertEqual(sorted(scheduler.pop_due(scheduler.next_due())), ['a', 'b'])
+
+    def test_run_now_keeps_the_regular_slot(self):
+        scheduler = CheckScheduler(jitter=0)
+        start = time.monotonic() + 100
+        scheduler.add('a', 10, first_slot=start)
+        scheduler.run_now(['a'])
+
+        self.assertEqual(scheduler.pop_due(), ['a'])
+        self.assertEqual(scheduler.next_due(), start)
+
+    def test_remove_forgets_empty_groups(self):
+        scheduler = CheckScheduler()
+        scheduler.add('a', 10, group='db1')
+        scheduler.add('b', 10, group='db1')
+        scheduler.remove('a')
+        self.assertIn('db1', scheduler._group_slots)
+        scheduler.remove('b')
+        self.assertEqual(scheduler._group_slots, {})
+        self.assertEqual(len(scheduler), 0)
+        self.assertIsNone(scheduler.next_due())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Tests for the SQLite table cache and change detection of SQLiteDriver.
+"""
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from database_utils.schema_cache import SchemaCache
+from databaseChecker import SQLiteDriver
+
+
+def create_database(path: str, table_name: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute(f"CREATE TABLE {table_name} (id INTEGER)")
+    conn.commit()
+    conn.close()
+
+
+class SQLiteDriverCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.db_path = os.path.join(directory, 'checked.sqlite')
+        self.other_path = os.path.join(directory, 'other.sqlite')
+        create_database(self.db_path, 'first')
+        create_database(self.other_path, 'third')
+        self.driver = SQLiteDriver(SimpleNamespace(schema_cache=SchemaCache()))
+        self.settings = {'db_path': self.db_path}
+
+    def probe(self) -> dict:
+        return self.driver.probe(self.settings, ['first', 'third'], 5)
+
+    def test_unchanged_file_is_served_from_the_cache(self):
+        self.assertEqual(self.probe(), {'first': True, 'third': False})
+        self.assertFalse(self.driver.schema_changed(self.db_path))
+        self.assertEqual(self.probe(), {'first': True, 'third': False})
+
+    def test_own_probe_of_a_wal_database_is_not_a_change(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.close()
+        self.probe()
+        self.assertFalse(self.driver.schema_changed(self.db_path))
+
+    def test_file_renamed_over_the_database_is_read_again(self):
+        self.probe()
+        os.replace(self.other_path, self.db_path)
+        self.assertTrue(self.driver.schema_changed(self.db_path))
+        self.assertEqual(self.probe(), {'first': False, 'third': True})
+
+    def test_file_copied_over_the_database_is_read_again(self):
+        self.probe()
+        shutil.copyfile(self.other_path, self.db_path)
+        self.assertTrue(self.driver.schema_changed(self.db_path))
+        self.assertEqual(self.probe(), {'first': False, 'third': True})
+
+
+if __name__ == '__main__':
+    unittest.main()